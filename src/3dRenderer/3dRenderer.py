@@ -1,12 +1,16 @@
-import pygame
+import argparse
 import math
+import os
+import sys
+from time import perf_counter_ns
 
-# ---------- INIT ----------
-pygame.init()
+from dynamicResolution import ResolutionScaler
+from mapLoader import Level, load_map
+from raycaster import Raycaster, map_to_array
+
+# ---------- SETTINGS ----------
 WIDTH, HEIGHT = 1200, 900
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("3dRenderer")
-clock = pygame.time.Clock()
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # ---------- MAP ----------
 WORLD_MAP = [
@@ -22,155 +26,165 @@ WORLD_MAP = [
     "100100000001",
     "111111111111"
 ]
-MAP_W = len(WORLD_MAP[0])
-MAP_H = len(WORLD_MAP)
 
 # ---------- CONSTANTS ----------
 TILE = 32
 FOV = math.pi / 3
-HALF_FOV = FOV / 2
 NUM_RAYS = WIDTH // 2
-EPS = 1e-6
 MAX_WALL_HEIGHT = HEIGHT * 2
+CEILING_COLOR = (100, 100, 100)
+FLOOR_COLOR = (50, 50, 50)
 
 # Mini-map settings
 MINIMAP_SCALE = 8
 MINIMAP_POS = (10, 10)
+MINIMAP_CELLS = 24  # cells shown around the player on large maps
 
 # ---------- PLAYER ----------
-px, py = 150, 150
-pa = 0.0
 SPEED = 1.5
 ROT = 0.04
 
 # ---------- TEXTURE ----------
-wall_texture = pygame.image.load("wall.png").convert()
-wall_texture = pygame.transform.scale(wall_texture, (64, 64))
-
-# ---------- RAYCAST ----------
-def cast_rays():
-    start_angle = pa - HALF_FOV
-    for ray in range(NUM_RAYS):
-        angle = start_angle + ray * FOV / NUM_RAYS
-        sin_a = math.sin(angle)
-        cos_a = math.cos(angle)
-
-        map_x = int(px // TILE)
-        map_y = int(py // TILE)
-
-        step_x = 1 if cos_a > 0 else -1
-        step_y = 1 if sin_a > 0 else -1
+def load_wall_texture():
+    import pygame
 
-        cos_a = cos_a if abs(cos_a) > EPS else EPS
-        sin_a = sin_a if abs(sin_a) > EPS else EPS
+    # relative to this file, not the working directory
+    texture = pygame.image.load(os.path.join(ASSET_DIR, "wall.png")).convert()
+    return pygame.transform.scale(texture, (64, 64))
 
-        delta_x = abs(TILE / cos_a)
-        delta_y = abs(TILE / sin_a)
+# ---------- DYNAMIC RESOLUTION ----------
+def make_resolution_surface(scaler, font):
+    import pygame
 
-        if step_x > 0:
-            side_x = ((map_x + 1) * TILE - px) / cos_a
-        else:
-            side_x = (px - map_x * TILE) / -cos_a
-
-        if step_y > 0:
-            side_y = ((map_y + 1) * TILE - py) / sin_a
-        else:
-            side_y = (py - map_y * TILE) / -sin_a
-
-        for _ in range(64):
-            if side_x < side_y:
-                depth = side_x
-                side_x += delta_x
-                map_x += step_x
-                hit_vertical = True
-            else:
-                depth = side_y
-                side_y += delta_y
-                map_y += step_y
-                hit_vertical = False
-
-            # ---- bounds check ----
-            if not (0 <= map_x < MAP_W and 0 <= map_y < MAP_H):
-                break
-
-            if WORLD_MAP[map_y][map_x] == "1":
-                # fish-eye correction
-                depth *= math.cos(pa - angle)
-
-                # clamp wall height
-                wall_h = min(30000 / (depth + EPS), MAX_WALL_HEIGHT)
-
-                # compute texture coordinate safely
-                if hit_vertical:
-                    hit_pos = py + depth * sin_a
-                else:
-                    hit_pos = px + depth * cos_a
-                hit_pos %= TILE
-                tex_x = int(hit_pos / TILE * wall_texture.get_width())
-                tex_x = max(0, min(wall_texture.get_width() - 1, tex_x))
-
-                column = wall_texture.subsurface(tex_x, 0, 1, wall_texture.get_height())
-                column = pygame.transform.scale(column, (2, int(wall_h)))
-                screen.blit(column, (ray * 2, HEIGHT // 2 - wall_h // 2))
-                break
+    text = scaler.describe(HEIGHT)
+    pygame.display.set_caption(f"3dRenderer - {text}")
+    return font.render(text, True, (0, 255, 0))
 
 # ---------- MINI-MAP ----------
-def draw_minimap():
-    for y in range(MAP_H):
-        for x in range(MAP_W):
-            color = (200, 200, 200) if WORLD_MAP[y][x] == "1" else (30, 30, 30)
+def draw_minimap(screen, level, px, py, pa):
+    import pygame
+
+    # window of cells around the player, clamped to the map
+    map_w, map_h = level.width, level.height
+    x0 = max(0, min(map_w - MINIMAP_CELLS, int(px // TILE) - MINIMAP_CELLS // 2))
+    y0 = max(0, min(map_h - MINIMAP_CELLS, int(py // TILE) - MINIMAP_CELLS // 2))
+    for y in range(y0, min(map_h, y0 + MINIMAP_CELLS)):
+        for x in range(x0, min(map_w, x0 + MINIMAP_CELLS)):
+            color = (200, 200, 200) if level.world[y, x] else (30, 30, 30)
             rect = pygame.Rect(
-                MINIMAP_POS[0] + x * MINIMAP_SCALE,
-                MINIMAP_POS[1] + y * MINIMAP_SCALE,
+                MINIMAP_POS[0] + (x - x0) * MINIMAP_SCALE,
+                MINIMAP_POS[1] + (y - y0) * MINIMAP_SCALE,
                 MINIMAP_SCALE,
                 MINIMAP_SCALE
             )
             pygame.draw.rect(screen, color, rect)
 
     # Draw player on minimap
+    origin_x = MINIMAP_POS[0] - x0 * MINIMAP_SCALE
+    origin_y = MINIMAP_POS[1] - y0 * MINIMAP_SCALE
     player_rect = pygame.Rect(
-        MINIMAP_POS[0] + px / TILE * MINIMAP_SCALE - 2,
-        MINIMAP_POS[1] + py / TILE * MINIMAP_SCALE - 2,
+        origin_x + px / TILE * MINIMAP_SCALE - 2,
+        origin_y + py / TILE * MINIMAP_SCALE - 2,
         4,
         4
     )
     pygame.draw.rect(screen, (0, 255, 0), player_rect)
 
     # Draw direction line
-    end_x = MINIMAP_POS[0] + (px + math.cos(pa) * 20) / TILE * MINIMAP_SCALE
-    end_y = MINIMAP_POS[1] + (py + math.sin(pa) * 20) / TILE * MINIMAP_SCALE
+    end_x = origin_x + (px + math.cos(pa) * 20) / TILE * MINIMAP_SCALE
+    end_y = origin_y + (py + math.sin(pa) * 20) / TILE * MINIMAP_SCALE
     pygame.draw.line(screen, (0, 255, 0),
-                     (MINIMAP_POS[0] + px / TILE * MINIMAP_SCALE,
-                      MINIMAP_POS[1] + py / TILE * MINIMAP_SCALE),
+                     (origin_x + px / TILE * MINIMAP_SCALE,
+                      origin_y + py / TILE * MINIMAP_SCALE),
                      (end_x, end_y), 2)
 
-# ---------- MAIN LOOP ----------
-running = True
-while running:
-    screen.fill((100, 100, 100))  # ceiling
-    pygame.draw.rect(screen, (50, 50, 50), (0, HEIGHT // 2, WIDTH, HEIGHT // 2))  # floor
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # Movement
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_a]:
-        pa -= ROT
-    if keys[pygame.K_d]:
-        pa += ROT
-    if keys[pygame.K_w]:
-        px += SPEED * math.cos(pa)
-        py += SPEED * math.sin(pa)
-    if keys[pygame.K_s]:
-        px -= SPEED * math.cos(pa)
-        py -= SPEED * math.sin(pa)
-
-    cast_rays()
-    draw_minimap()
-
-    pygame.display.flip()
-    clock.tick(60)
-
-pygame.quit()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="3dRenderer")
+    parser.add_argument("--map", help="level file (text or .npy) to play instead of WORLD_MAP")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="scale the number of rays to keep cast + draw within --target-ms")
+    parser.add_argument("--target-ms", type=float, default=6.0, help="cast + draw budget per frame")
+    args = parser.parse_args(argv)
+
+    level = load_map(args.map) if args.map else Level(map_to_array(WORLD_MAP))
+    if args.map:
+        px, py = (c * TILE + TILE / 2 for c in level.spawn)
+    else:
+        px, py = 150, 150
+    pa = 0.0
+
+    import pygame
+    from renderer import ColumnRenderer
+
+    # frameProfiler lives one directory up
+    src_dir = os.path.dirname(ASSET_DIR)
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    from frameProfiler import FrameProfiler
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("3dRenderer")
+    clock = pygame.time.Clock()
+
+    # ---------- RAYCAST ----------
+    caster = Raycaster(level.world, TILE, FOV, level.distance)
+    renderer = ColumnRenderer(WIDTH, HEIGHT, load_wall_texture(), CEILING_COLOR, FLOOR_COLOR, MAX_WALL_HEIGHT)
+
+    def cast_rays(num_rays, col_width):
+        depth, _, tex_x = caster.cast(px, py, pa, num_rays, renderer.tex_w)
+        # ceiling, walls and floor in one pass, each ray stretched to col_width pixels
+        renderer.render(screen, depth, tex_x, col_width)
+
+    scaler = ResolutionScaler(WIDTH, args.target_ms, start_col=WIDTH // NUM_RAYS) if args.adaptive else None
+    font = pygame.font.Font(None, 24)
+    resolution_surf = make_resolution_surface(scaler, font) if scaler else None
+
+    # ---------- MAIN LOOP ----------
+    profiler = FrameProfiler("3dRenderer")
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            profiler.handle_event(event)
+
+        # Movement
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_a]:
+            pa -= ROT
+        if keys[pygame.K_d]:
+            pa += ROT
+        if keys[pygame.K_w]:
+            px += SPEED * math.cos(pa)
+            py += SPEED * math.sin(pa)
+        if keys[pygame.K_s]:
+            px -= SPEED * math.cos(pa)
+            py -= SPEED * math.sin(pa)
+        profiler.mark("input")
+
+        if scaler is None:
+            cast_rays(NUM_RAYS, WIDTH // NUM_RAYS)
+        else:
+            start = perf_counter_ns()
+            cast_rays(scaler.num_rays, scaler.col_width)
+            if scaler.update((perf_counter_ns() - start) / 1e6):
+                resolution_surf = make_resolution_surface(scaler, font)
+        profiler.mark("cast")
+        draw_minimap(screen, level, px, py, pa)
+        if resolution_surf is not None:
+            screen.blit(resolution_surf, (10, HEIGHT - 30))
+        profiler.draw(screen, (WIDTH - 340, 10))
+        profiler.mark("minimap")
+
+        pygame.display.flip()
+        profiler.mark("flip")
+        clock.tick(60)
+        profiler.mark("tick")
+        profiler.end_frame()
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import math
+
+
+# ---------- DYNAMIC RESOLUTION ----------
+class ResolutionScaler:
+    """Picks the column width (and so the ray count) that keeps cast + draw within budget.
+
+    Column widths run from ``min_col`` (finest) to ``max_col`` (coarsest);
+    each level casts ``ceil(width / col_width)`` rays and the renderer
+    stretches every ray across ``col_width`` pixels, so the image always
+    fills the window. The measured cost is smoothed, and the level only
+    changes after it has been over budget (or predicted to fit one level
+    finer with room to spare) for several frames in a row, with a cooldown
+    after every change so it does not flicker.
+    """
+
+    def __init__(self, width, target_ms, start_col=2, min_col=1, max_col=8,
+                 smoothing=0.1, headroom=0.8, down_frames=5, up_frames=60, cooldown=30):
+        self.width = width
+        self.target_ms = target_ms
+        self.min_col = min_col
+        self.max_col = max_col
+        self.col_width = start_col
+        self.smoothing = smoothing
+        self.headroom = headroom
+        self.down_frames = down_frames
+        self.up_frames = up_frames
+        self.cooldown = cooldown
+
+        self.cost_ms = None
+        self._over = 0
+        self._under = 0
+        self._wait = 0
+
+    @property
+    def num_rays(self):
+        return math.ceil(self.width / self.col_width)
+
+    def describe(self, height):
+        return f"{self.num_rays}x{height} ({self.col_width}px columns)"
+
+    def update(self, cost_ms):
+        """Feed the cast + draw time of the last frame. Returns True if the level changed."""
+        if self.cost_ms is None:
+            self.cost_ms = cost_ms
+        else:
+            self.cost_ms += self.smoothing * (cost_ms - self.cost_ms)
+
+        if self._wait > 0:
+            self._wait -= 1
+            return False
+
+        # cost is roughly proportional to the ray count
+        finer_rays = math.ceil(self.width / max(self.min_col, self.col_width - 1))
+        predicted_finer = self.cost_ms * finer_rays / self.num_rays
+
+        self._over = self._over + 1 if self.cost_ms > self.target_ms else 0
+        self._under = self._under + 1 if predicted_finer < self.target_ms * self.headroom else 0
+
+        if self._over >= self.down_frames and self.col_width < self.max_col:
+            self._set(self.col_width + 1)
+            return True
+        if self._under >= self.up_frames and self.col_width > self.min_col:
+            self._set(self.col_width - 1)
+            return True
+        return False
+
+    def _set(self, col_width):
+        # rescale the smoothed cost to the new ray count so the next decision starts sensibly
+        old_rays = self.num_rays
+        self.col_width = col_width
+        self.cost_ms *= self.num_rays / old_rays
+        self._over = self._under = 0
+        self._wait = self.cooldown
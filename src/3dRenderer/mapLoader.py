@@ -0,0 +1,119 @@
+import numpy as np
+
+from raycaster import distance_field
+
+# ---------- FORMAT ----------
+# Text levels use one character per cell, one line per row, like WORLD_MAP.
+# Rows may differ in length; missing cells are empty.
+WALL_CHARS = b"1#"
+SPAWN_CHARS = b"Pp@"
+
+
+class Level:
+    """A loaded map: walls as a (rows, cols) uint8 array plus its distance field."""
+
+    def __init__(self, world, spawn=None):
+        self.world = world
+        self.distance = distance_field(world)
+        self.spawn = spawn if spawn is not None else self._most_open_cell()
+
+    @property
+    def width(self):
+        return self.world.shape[1]
+
+    @property
+    def height(self):
+        return self.world.shape[0]
+
+    def _most_open_cell(self):
+        """Most open cell of the level, used when the file has no spawn marker."""
+        y, x = np.unravel_index(np.argmax(self.distance), self.distance.shape)
+        return int(x), int(y)
+
+
+def load_map(path):
+    """Read a level from a text file (or a .npy array of 0/1 cells) into a Level."""
+    if str(path).endswith(".npy"):
+        return Level((np.load(path) != 0).astype(np.uint8))
+
+    with open(path, "rb") as f:
+        lines = [line.rstrip(b"\r\n") for line in f]
+    while lines and not lines[-1]:
+        lines.pop()
+
+    width = max((len(line) for line in lines), default=0)
+    world = np.zeros((len(lines), width), dtype=np.uint8)
+    walls = np.zeros(256, dtype=np.uint8)
+    walls[list(WALL_CHARS)] = 1
+
+    spawn = None
+    for y, line in enumerate(lines):
+        cells = np.frombuffer(line, dtype=np.uint8)
+        world[y, :len(cells)] = walls[cells]
+        if spawn is None:
+            for c in SPAWN_CHARS:
+                x = line.find(bytes([c]))
+                if x >= 0:
+                    spawn = (x, y)
+                    break
+    return Level(world, spawn)
+
+
+def save_map(path, world, spawn=None):
+    rows = np.where(world != 0, ord("1"), ord("0")).astype(np.uint8)
+    if spawn is not None:
+        rows[spawn[1], spawn[0]] = ord("P")
+    with open(path, "wb") as f:
+        for row in rows:
+            f.write(row.tobytes())
+            f.write(b"\n")
+
+
+def generate_map(width, height, pillars=0.002, rooms=0.0005, seed=0):
+    """Random test level: solid border, scattered pillars and hollow rooms."""
+    rng = np.random.default_rng(seed)
+    world = (rng.random((height, width)) < pillars).astype(np.uint8)
+    for _ in range(int(width * height * rooms)):
+        w, h = rng.integers(4, 24, size=2)
+        x, y = rng.integers(1, width - w - 1), rng.integers(1, height - h - 1)
+        world[y, x:x + w] = world[y + h - 1, x:x + w] = 1
+        world[y:y + h, x] = world[y:y + h, x + w - 1] = 1
+        world[y + h // 2, x] = 0  # doorway
+    world[0, :] = world[-1, :] = world[:, 0] = world[:, -1] = 1
+    world[height // 2, width // 2] = 0
+    return world
+
+
+if __name__ == "__main__":
+    import argparse
+    import math
+    import time
+
+    from raycaster import Raycaster
+
+    parser = argparse.ArgumentParser(description="Generate or benchmark raycaster levels")
+    parser.add_argument("--generate", metavar="PATH", help="write a random level to PATH")
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--bench", metavar="PATH", help="load PATH and time casting from its spawn")
+    args = parser.parse_args()
+
+    if args.generate:
+        world = generate_map(args.size, args.size)
+        save_map(args.generate, world, (args.size // 2, args.size // 2))
+        print(f"wrote {args.size}x{args.size} level to {args.generate}")
+
+    if args.bench:
+        start = time.perf_counter()
+        level = load_map(args.bench)
+        print(f"loaded {level.width}x{level.height} (+ distance field) in "
+              f"{time.perf_counter() - start:.2f}s, spawn {level.spawn}")
+        caster = Raycaster(level.world, 32, math.pi / 3, level.distance)
+        x, y = (c * 32 + 16 for c in level.spawn)
+        frames = 100
+        iterations = 0
+        start = time.perf_counter()
+        for i in range(frames):
+            caster.cast(x, y, i * 2 * math.pi / frames, 600, 64)
+            iterations += caster.iterations
+        ms = (time.perf_counter() - start) / frames * 1000
+        print(f"600 rays: {ms:.2f} ms/frame, {iterations / frames:.0f} DDA iterations/frame")
@@ -0,0 +1,96 @@
+import numpy as np
+import pygame
+
+
+# ---------- COLUMN RENDERER ----------
+class ColumnRenderer:
+    """Writes ceiling, textured walls and floor straight into the screen pixels.
+
+    The texture is kept as a flat array of mapped pixel values with two extra
+    "texels" for the ceiling and floor colours. For every integer wall height
+    a lookup row maps each screen row to one of those texels, so a whole frame
+    is a single gather ``texels[tex_x * stride + rows[height]]`` written into
+    the surface through ``pygame.surfarray``. Per-frame work allocates only a
+    couple of per-ray arrays.
+    """
+
+    def __init__(self, width, height, texture, ceiling, floor, max_wall_height):
+        self.width = width
+        self.height = height
+        self.max_wall_height = int(max_wall_height)
+
+        tex = pygame.surfarray.array3d(texture)  # (tex_w, tex_h, 3)
+        self.tex_w, self.tex_h = tex.shape[:2]
+        self.stride = self.tex_h + 2
+        texels = np.empty((self.tex_w, self.stride, 3), dtype=np.uint8)
+        texels[:, :self.tex_h] = tex
+        texels[:, self.tex_h] = ceiling
+        texels[:, self.tex_h + 1] = floor
+        self.texels_rgb = texels.reshape(-1, 1, 3)
+
+        self.rows = self._build_rows()
+        self._texels = None
+        self._format = None
+        self._num_rays = None
+        self._fallback = None
+
+    def _build_rows(self):
+        """rows[h, y] = texel row shown at screen row y for a wall of height h."""
+        heights = np.arange(self.max_wall_height + 1)[:, None]
+        y = np.arange(self.height)[None, :]
+        top = self.height // 2 - heights // 2
+        k = y - top
+        tex_y = (k * self.tex_h) // np.maximum(heights, 1)
+        rows = np.where(y < self.height // 2, self.tex_h, self.tex_h + 1)
+        rows = np.where((k >= 0) & (k < heights), tex_y, rows)
+        return rows.astype(np.int32)
+
+    def _mapped_texels(self, screen):
+        # texels as the screen's own pixel values, remapped if its format changes
+        fmt = (screen.get_bitsize(), screen.get_masks())
+        if fmt != self._format:
+            self._format = fmt
+            mapped = pygame.surfarray.map_array(screen, self.texels_rgb)[:, 0]
+            self._texels = mapped.astype(np.uint32)
+        return self._texels
+
+    def _buffers(self, num_rays):
+        if num_rays != self._num_rays:
+            self._num_rays = num_rays
+            self._index = np.empty((num_rays, self.height), dtype=np.int32)
+            self._column = np.empty((num_rays, self.height), dtype=np.uint32)
+            self._wall = np.empty(num_rays)
+            self._heights = np.empty(num_rays, dtype=np.int64)
+        return self._index, self._column, self._wall, self._heights
+
+    def render(self, screen, depth, tex_x, col_width, wall_scale=30000, eps=1e-6):
+        """Draw one frame of ``len(depth)`` columns, each ``col_width`` pixels wide."""
+        num_rays = len(depth)
+        texels = self._mapped_texels(screen)
+        index, column, wall, heights = self._buffers(num_rays)
+
+        # wall height per ray; misses (inf depth) become 0 -> plain ceiling/floor
+        np.add(depth, eps, out=wall)
+        np.divide(wall_scale, wall, out=wall)
+        np.minimum(wall, self.max_wall_height, out=wall)
+        heights[:] = wall
+
+        np.take(self.rows, heights, axis=0, out=index, mode="clip")
+        index += (tex_x * self.stride).astype(np.int32)[:, None]
+        np.take(texels, index, out=column, mode="clip")
+
+        # stretch every ray over col_width pixels; the last column may be cut off
+        drawn = min(self.width, num_rays * col_width)
+        if screen.get_bytesize() == 3:
+            # 24 bit surfaces cannot be viewed as 2d pixels; take one extra copy
+            if self._fallback is None or self._fallback.shape[0] != drawn:
+                self._fallback = np.empty((drawn, self.height), dtype=np.uint32)
+            pixels = self._fallback
+        else:
+            pixels = pygame.surfarray.pixels2d(screen)
+        for j in range(col_width):
+            target = pixels[j:drawn:col_width]
+            target[:] = column[:len(target)]
+        if pixels is self._fallback:
+            pygame.surfarray.blit_array(screen.subsurface((0, 0, drawn, self.height)), pixels)
+        del pixels, target
@@ -0,0 +1,7 @@
+"""Game of Life engines that follow CGOL.c's rules on boards of any size."""
+from .bitboard import BitBoard
+from .chunked import ChunkedLife
+from .hashlife import HashLife
+from .patterns import parse_cgol, read_rle, write_rle
+
+__all__ = ["BitBoard", "ChunkedLife", "HashLife", "parse_cgol", "read_rle", "write_rle"]
@@ -0,0 +1,130 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from . import BitBoard, ChunkedLife, HashLife, parse_cgol
+from .patterns import GOSPER_GUN
+
+
+def play(args):
+    """Same dialogue as CGOL.c, on a board of any size.
+
+    With ``--engine hashlife`` every Enter advances 2**jump generations on the
+    unbounded plane and the grid_size window is shown; ``--engine chunked``
+    is also unbounded but steps one generation at a time.
+    """
+    interactive = sys.stdin.isatty()
+
+    def ask(prompt):
+        if interactive:
+            return input(prompt)
+        return sys.stdin.readline()
+
+    grid_size = int(ask("Grid size: "))
+    count = int(ask("Live cell num: "))
+    pairs = " ".join(ask("X Y: ") for _ in range(count))
+    gens = int(ask("Generations: "))
+    _, cells, _ = parse_cgol(f"{grid_size} {count} {pairs}")
+
+    if args.engine == "hashlife":
+        board = HashLife()
+        board.load_cgol(grid_size, cells)
+
+        def advance():
+            board.jump(args.jump)
+
+        def render():
+            text = board.render(0, 0, grid_size, grid_size)
+            if args.stats:
+                text += "\n" + " ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}"
+                                        for k, v in board.stats().items())
+            return text
+    elif args.engine == "chunked":
+        board = ChunkedLife()
+        board.set_cells([col for _, col in cells], [row for row, _ in cells])
+        advance = board.step
+
+        def render():
+            return board.render(0, 0, grid_size, grid_size)
+    else:
+        board = BitBoard(grid_size, grid_size, wrap=args.wrap)
+        for row, col in cells:
+            board.set(row, col)
+        advance, render = board.step, board.render
+
+    for _ in range(gens):
+        if interactive:
+            os.system("clear")
+        print(f"Generation {board.generation + 1}:")
+        print(render())
+        if interactive:
+            input("\nPress Enter to continue...")
+        advance()
+
+    if interactive:
+        os.system("clear")
+    print("Final Generation:")
+    print(render())
+
+
+def run_rle(args):
+    """Load an RLE file, run it for --generations on the chunked engine, optionally save it."""
+    board = ChunkedLife()
+    start = time.perf_counter()
+    board.load_rle(args.rle)
+    print(f"loaded {args.rle} in {time.perf_counter() - start:.2f}s: {board.stats()}")
+    start = time.perf_counter()
+    board.step(args.generations)
+    elapsed = time.perf_counter() - start
+    print(f"{args.generations} generations: {elapsed / max(args.generations, 1) * 1000:.2f} ms/generation, "
+          f"{board.stats()}")
+    if args.out:
+        board.save_rle(args.out, f"{args.rle} after {board.generation} generations")
+        print(f"wrote {args.out}")
+
+
+def bench_hashlife(args):
+    board = HashLife()
+    board.load_cgol(40, GOSPER_GUN)
+    start = time.perf_counter()
+    board.jump(args.gun_jump)
+    elapsed = time.perf_counter() - start
+    print(f"Gosper gun to generation 2**{args.gun_jump} in {elapsed:.3f}s: {board.stats()}")
+
+
+def bench(args):
+    rng = np.random.default_rng(0)
+    board = BitBoard.from_array(rng.random((args.bench, args.bench)) < 0.3, wrap=args.wrap)
+    board.step()  # warm up buffers
+    start = time.perf_counter()
+    board.step(args.generations)
+    elapsed = time.perf_counter() - start
+    print(f"{args.bench}x{args.bench} {'wrap' if args.wrap else 'dead'} border: "
+          f"{elapsed / args.generations * 1000:.1f} ms/generation, "
+          f"{args.bench * args.bench * args.generations / elapsed / 1e9:.2f} Gcells/s, "
+          f"population {board.population()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m life", description="Game of Life engines")
+    parser.add_argument("--engine", choices=("bitboard", "hashlife", "chunked"), default="bitboard")
+    parser.add_argument("--wrap", action="store_true", help="toroidal board instead of dead borders (bitboard)")
+    parser.add_argument("--jump", type=int, default=0, help="hashlife: advance 2**JUMP generations per step")
+    parser.add_argument("--stats", action="store_true", help="hashlife: show node and cache statistics")
+    parser.add_argument("--bench", type=int, metavar="SIZE", help="time a random SIZE x SIZE board")
+    parser.add_argument("--generations", type=int, default=20, help="generations to time with --bench or --rle")
+    parser.add_argument("--gun-jump", type=int, metavar="K", help="time hashlife on a Gosper gun to 2**K")
+    parser.add_argument("--rle", metavar="PATH", help="run an RLE pattern on the chunked engine")
+    parser.add_argument("--out", metavar="PATH", help="with --rle: write the final pattern as RLE")
+    args = parser.parse_args()
+    if args.rle:
+        run_rle(args)
+    elif args.gun_jump is not None:
+        bench_hashlife(args)
+    elif args.bench:
+        bench(args)
+    else:
+        play(args)
@@ -0,0 +1,144 @@
+import numpy as np
+
+WORD = 64
+ONE = np.uint64(1)
+TOP_BIT = np.uint64(WORD - 1)
+BAND_WORDS = 16384  # words per band of rows processed together in step()
+
+
+class BitBoard:
+    """Game of Life on a bit-packed board, stepped with word-wide bit logic.
+
+    Each row is stored as ``ceil(width / 64)`` little-endian uint64 words,
+    bit ``i`` of word ``k`` being column ``64 * k + i``. A generation is a
+    few dozen whole-array NumPy operations: the 3-wide horizontal sum of
+    every row is formed with shifted copies and a bitwise full adder, then
+    three of those rows are added the same way to get the 3x3 block count,
+    and the B3/S23 rule is evaluated on the resulting bit planes. The
+    vertical part runs in cache-sized bands of rows into a second buffer.
+
+    ``wrap=True`` makes the board a torus; otherwise cells outside it are
+    dead, like the border of CGOL.c's grid.
+    """
+
+    def __init__(self, width, height, wrap=False):
+        self.width = width
+        self.height = height
+        self.wrap = wrap
+        self.words = -(-width // WORD)
+        self.cells = np.zeros((height, self.words), dtype="<u8")
+        self.generation = 0
+
+        # padding bits past the last column must stay dead
+        tail = width % WORD
+        self._last_mask = np.uint64((1 << tail) - 1) if tail else ~np.uint64(0)
+
+        # row sums with one spare row above and below for the vertical neighbours
+        self._ones = np.zeros((height + 2, self.words), dtype="<u8")
+        self._twos = np.zeros((height + 2, self.words), dtype="<u8")
+        self._next = np.zeros_like(self.cells)
+
+    # ---- cells ----
+    @classmethod
+    def from_array(cls, alive, wrap=False):
+        """Build a board from a (rows, cols) boolean array."""
+        alive = np.asarray(alive, dtype=bool)
+        board = cls(alive.shape[1], alive.shape[0], wrap)
+        padded = np.zeros((board.height, board.words * WORD), dtype=np.uint8)
+        padded[:, :board.width] = alive
+        board.cells[:] = np.packbits(padded, axis=1, bitorder="little").view("<u8")
+        return board
+
+    def to_array(self):
+        bits = np.unpackbits(self.cells.view(np.uint8), axis=1, bitorder="little")
+        return bits[:, :self.width].astype(bool)
+
+    def set(self, row, col, alive=True):
+        word, bit = divmod(col, WORD)
+        mask = ONE << np.uint64(bit)
+        if alive:
+            self.cells[row, word] |= mask
+        else:
+            self.cells[row, word] &= ~mask
+
+    def get(self, row, col):
+        word, bit = divmod(col, WORD)
+        return bool((self.cells[row, word] >> np.uint64(bit)) & ONE)
+
+    def population(self):
+        return int(np.bitwise_count(self.cells).sum())
+
+    # ---- stepping ----
+    def _column(self, col):
+        word, bit = divmod(col, WORD)
+        return (self.cells[:, word] >> np.uint64(bit)) & ONE
+
+    def _horizontal_sums(self):
+        """Ones and twos bit planes of west + centre + east for every row."""
+        c = self.cells
+        west = c << ONE
+        west[:, 1:] |= c[:, :-1] >> TOP_BIT
+        east = c >> ONE
+        east[:, :-1] |= c[:, 1:] << TOP_BIT
+
+        if self.wrap:
+            # column 0's west neighbour is the last column and vice versa
+            first, last = self._column(0), self._column(self.width - 1)
+            west[:, 0] |= last
+            last_word, last_bit = divmod(self.width - 1, WORD)
+            east[:, last_word] &= ~(ONE << np.uint64(last_bit))
+            east[:, last_word] |= first << np.uint64(last_bit)
+
+        ones = self._ones[1:-1]
+        twos = self._twos[1:-1]
+        np.bitwise_xor(west, c, out=ones)
+        np.bitwise_and(west, c, out=twos)
+        # majority(west, c, east) = (west & c) | (east & (west ^ c))
+        twos |= east & ones
+        ones ^= east
+
+        if self.wrap:
+            self._ones[0], self._ones[-1] = self._ones[-2], self._ones[1]
+            self._twos[0], self._twos[-1] = self._twos[-2], self._twos[1]
+        return self._ones, self._twos
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            ones, twos = self._horizontal_sums()
+            cells, nxt = self.cells, self._next
+            # work in bands of rows so the temporaries stay in cache
+            band = max(1, BAND_WORDS // self.words)
+            for top in range(0, self.height, band):
+                bottom = min(top + band, self.height)
+                a1, b1, c1 = ones[top:bottom], ones[top + 1:bottom + 1], ones[top + 2:bottom + 2]
+                a2, b2, c2 = twos[top:bottom], twos[top + 1:bottom + 1], twos[top + 2:bottom + 2]
+
+                # add three 2-bit row sums into a 4-bit count of the 3x3 block
+                u0 = a1 ^ b1
+                carry = (a1 & b1) | (c1 & u0)
+                u0 ^= c1
+                x = a2 ^ b2
+                m = (a2 & b2) | (c2 & x)
+                x ^= c2
+                t1 = x ^ carry
+                carry &= x
+                t2 = m ^ carry
+                m &= carry  # weight-8 bit: block count >= 8
+
+                # block count 3 -> alive; block count 4 -> stays as it is (cell + 3 neighbours)
+                out = nxt[top:bottom]
+                np.bitwise_and(u0, t1, out=out)
+                out &= ~t2
+                u0 |= t1
+                np.bitwise_and(cells[top:bottom], t2, out=t2)
+                out |= t2 & ~u0
+                out &= ~m
+            nxt[:, -1] &= self._last_mask
+            self.cells, self._next = nxt, cells
+            self.generation += 1
+
+    # ---- display ----
+    def render(self, alive="#", dead="."):
+        """Text picture in CGOL.c's style: one character and a space per cell."""
+        chars = np.where(self.to_array(), alive, dead)
+        return "\n".join(" ".join(row) + " " for row in chars)
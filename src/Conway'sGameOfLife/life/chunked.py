@@ -0,0 +1,224 @@
+import numpy as np
+
+from .patterns import read_rle, write_rle
+
+CHUNK = 64
+LOAD_BATCH = 1 << 16  # cells gathered before they are scattered into chunks
+
+
+class ChunkedLife:
+    """Game of Life on the unbounded plane, stored as a dict of square chunks.
+
+    Only chunks that hold live cells exist. A generation updates those
+    chunks plus the empty neighbours that live cells on a shared edge or
+    corner could spill into, so the cost follows the live activity rather
+    than the area the pattern spans. All candidate chunks are padded with a
+    one-cell ring from their neighbours and stepped together as one
+    (chunks, size + 2, size + 2) array; chunks that end up empty are dropped.
+
+    Coordinates are (x, y) = (column, row) and may be negative.
+    """
+
+    def __init__(self, chunk_size=CHUNK):
+        self.size = chunk_size
+        self.chunks = {}  # (cx, cy) -> (size, size) uint8 array of 0/1
+        self.generation = 0
+
+    # ---- cells ----
+    def set(self, x, y, alive=True):
+        n = self.size
+        key = (x // n, y // n)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if not alive:
+                return
+            chunk = self.chunks[key] = np.zeros((n, n), dtype=np.uint8)
+        chunk[y % n, x % n] = alive
+        if not alive and not chunk.any():
+            del self.chunks[key]
+
+    def get(self, x, y):
+        n = self.size
+        chunk = self.chunks.get((x // n, y // n))
+        return chunk is not None and bool(chunk[y % n, x % n])
+
+    def set_cells(self, xs, ys):
+        """Make every (xs[i], ys[i]) alive; much faster than calling set() per cell."""
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        if not xs.size:
+            return
+        n = self.size
+        cx, cy = xs // n, ys // n
+        keys, inverse = np.unique(np.stack([cx, cy], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(keys) + 1))
+        for i, (kx, ky) in enumerate(keys.tolist()):
+            sel = order[bounds[i]:bounds[i + 1]]
+            chunk = self.chunks.get((kx, ky))
+            if chunk is None:
+                chunk = self.chunks[(kx, ky)] = np.zeros((n, n), dtype=np.uint8)
+            chunk[ys[sel] % n, xs[sel] % n] = 1
+
+    def clear(self):
+        self.chunks = {}
+        self.generation = 0
+
+    @property
+    def population(self):
+        return int(sum(int(np.count_nonzero(c)) for c in self.chunks.values()))
+
+    def cells(self):
+        """Live cells as (x, y) pairs."""
+        n = self.size
+        for (cx, cy), chunk in self.chunks.items():
+            ys, xs = np.nonzero(chunk)
+            yield from zip((xs + cx * n).tolist(), (ys + cy * n).tolist())
+
+    def bounds(self):
+        """(x0, y0, x1, y1) of the live cells, inclusive, or None if the board is empty."""
+        if not self.chunks:
+            return None
+        n = self.size
+        x0 = y0 = None
+        for (cx, cy), chunk in self.chunks.items():
+            rows = np.flatnonzero(chunk.any(axis=1))
+            cols = np.flatnonzero(chunk.any(axis=0))
+            lo_x, hi_x = cx * n + cols[0], cx * n + cols[-1]
+            lo_y, hi_y = cy * n + rows[0], cy * n + rows[-1]
+            if x0 is None:
+                x0, y0, x1, y1 = lo_x, lo_y, hi_x, hi_y
+            else:
+                x0, y0, x1, y1 = min(x0, lo_x), min(y0, lo_y), max(x1, hi_x), max(y1, hi_y)
+        return int(x0), int(y0), int(x1), int(y1)
+
+    def rows(self):
+        """Yield ``(y, xs)`` for every row with live cells, top to bottom, xs sorted."""
+        n = self.size
+        bands = {}
+        for cx, cy in self.chunks:
+            bands.setdefault(cy, []).append(cx)
+        for cy in sorted(bands):
+            strip = sorted(bands[cy])
+            for r in range(n):
+                xs = [np.flatnonzero(self.chunks[(cx, cy)][r]) + cx * n for cx in strip]
+                xs = np.concatenate(xs)
+                if xs.size:
+                    yield cy * n + r, xs
+
+    # ---- evolution ----
+    def _candidates(self):
+        """Live chunks plus the empty neighbours their edge cells reach."""
+        out = set(self.chunks)
+        for (cx, cy), c in self.chunks.items():
+            top, bottom = c[0].any(), c[-1].any()
+            left, right = c[:, 0].any(), c[:, -1].any()
+            if top:
+                out.add((cx, cy - 1))
+            if bottom:
+                out.add((cx, cy + 1))
+            if left:
+                out.add((cx - 1, cy))
+            if right:
+                out.add((cx + 1, cy))
+            if c[0, 0]:
+                out.add((cx - 1, cy - 1))
+            if c[0, -1]:
+                out.add((cx + 1, cy - 1))
+            if c[-1, 0]:
+                out.add((cx - 1, cy + 1))
+            if c[-1, -1]:
+                out.add((cx + 1, cy + 1))
+        return list(out)
+
+    def _step_once(self):
+        keys = self._candidates()
+        if not keys:
+            self.generation += 1
+            return
+        chunks = self.chunks
+        padded = np.zeros((len(keys), self.size + 2, self.size + 2), dtype=np.uint8)
+        for i, (cx, cy) in enumerate(keys):
+            p = padded[i]
+            c = chunks.get((cx, cy))
+            if c is not None:
+                p[1:-1, 1:-1] = c
+            c = chunks.get((cx, cy - 1))
+            if c is not None:
+                p[0, 1:-1] = c[-1]
+            c = chunks.get((cx, cy + 1))
+            if c is not None:
+                p[-1, 1:-1] = c[0]
+            c = chunks.get((cx - 1, cy))
+            if c is not None:
+                p[1:-1, 0] = c[:, -1]
+            c = chunks.get((cx + 1, cy))
+            if c is not None:
+                p[1:-1, -1] = c[:, 0]
+            c = chunks.get((cx - 1, cy - 1))
+            if c is not None:
+                p[0, 0] = c[-1, -1]
+            c = chunks.get((cx + 1, cy - 1))
+            if c is not None:
+                p[0, -1] = c[-1, 0]
+            c = chunks.get((cx - 1, cy + 1))
+            if c is not None:
+                p[-1, 0] = c[0, -1]
+            c = chunks.get((cx + 1, cy + 1))
+            if c is not None:
+                p[-1, -1] = c[0, 0]
+
+        # 3x3 block sum: rows first, then columns
+        rows = padded[:, :, :-2] + padded[:, :, 1:-1] + padded[:, :, 2:]
+        block = rows[:, :-2] + rows[:, 1:-1] + rows[:, 2:]
+        alive = padded[:, 1:-1, 1:-1]
+        # B3/S23 on the block sum (cell included): 3 -> alive, 4 -> unchanged
+        nxt = ((block == 3) | ((block == 4) & (alive == 1))).view(np.uint8)
+
+        keep = nxt.reshape(len(keys), -1).any(axis=1)
+        self.chunks = {key: nxt[i] for i, key in enumerate(keys) if keep[i]}
+        self.generation += 1
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            self._step_once()
+
+    # ---- RLE ----
+    def load_rle(self, path):
+        """Add the live cells of an RLE file, read a line at a time."""
+        xs, ys = [], []
+        with open(path) as f:
+            for x, y in read_rle(f):
+                xs.append(x)
+                ys.append(y)
+                if len(xs) >= LOAD_BATCH:
+                    self.set_cells(xs, ys)
+                    xs, ys = [], []
+        self.set_cells(xs, ys)
+
+    def save_rle(self, path, comment=None):
+        """Write the live cells to an RLE file, one row of chunks at a time."""
+        box = self.bounds()
+        with open(path, "w") as f:
+            if box is None:
+                write_rle(f, (), 0, 0, comment)
+                return
+            x0, y0, x1, y1 = box
+            rows = ((y - y0, xs - x0) for y, xs in self.rows())
+            write_rle(f, rows, x1 - x0 + 1, y1 - y0 + 1, comment)
+
+    def stats(self):
+        return {
+            "generation": self.generation,
+            "population": self.population,
+            "chunks": len(self.chunks),
+            "chunk_size": self.size,
+        }
+
+    def render(self, x0, y0, width, height, alive="#", dead="."):
+        """Text picture of a window in CGOL.c's style."""
+        return "\n".join(
+            " ".join(alive if self.get(x, y) else dead for x in range(x0, x0 + width)) + " "
+            for y in range(y0, y0 + height)
+        )
@@ -0,0 +1,291 @@
+class Node:
+    """Square of 2**level cells, shared by every place it occurs (hash-consed).
+
+    Level 0 nodes are single cells; higher levels have four children.
+    ``results`` memoizes ``HashLife._successor`` per step exponent.
+    """
+
+    __slots__ = ("level", "population", "nw", "ne", "sw", "se", "results", "__weakref__")
+
+    def __init__(self, level, population, nw=None, ne=None, sw=None, se=None):
+        self.level = level
+        self.population = population
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.results = None
+
+
+class _CacheFull(Exception):
+    """Raised inside a bounded step when the node table passes ``max_nodes``."""
+
+
+DEAD = Node(0, 0)
+ALIVE = Node(0, 1)
+
+
+class HashLife:
+    """Gosper's HashLife on the unbounded plane.
+
+    Identical squares are stored once in a table keyed by their four
+    children, and the future of each square's centre is cached on the node,
+    so regular patterns (guns, spaceships, oscillators) advance 2**k
+    generations in time roughly proportional to k. The table never grows
+    much past ``max_nodes``: a step that would overflow it is abandoned,
+    the nodes no longer reachable from the current universe are dropped
+    (and the memoized results too if that is not enough), and the step is
+    redone as two half-size steps. Only a single generation is allowed to
+    overshoot, when the live pattern alone does not fit.
+
+    Coordinates are (x, y) = (column, row) around an origin at the centre
+    of the root square. Unlike CGOL.c's grid there is no border: patterns
+    that reach the edge of the loaded grid keep going.
+    """
+
+    def __init__(self, max_nodes=1_000_000):
+        self.max_nodes = max_nodes
+        self.table = {}
+        self._bounded = False  # join() raises _CacheFull when set and the table is full
+        self._empty = [DEAD]
+        self.root = self.empty(3)
+        self.generation = 0
+
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.gc_runs = 0
+        self.split_steps = 0
+
+    # ---- node construction ----
+    def join(self, nw, ne, sw, se):
+        key = (nw, ne, sw, se)
+        node = self.table.get(key)
+        if node is None:
+            if self._bounded and len(self.table) >= self.max_nodes:
+                raise _CacheFull
+            node = Node(nw.level + 1, nw.population + ne.population + sw.population + se.population,
+                        nw, ne, sw, se)
+            self.table[key] = node
+        return node
+
+    def empty(self, level):
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[level]
+
+    def _expand(self, node):
+        """Same cells, one level bigger, centred."""
+        e = self.empty(node.level - 1)
+        return self.join(self.join(e, e, e, node.nw), self.join(e, e, node.ne, e),
+                         self.join(e, node.sw, e, e), self.join(node.se, e, e, e))
+
+    def _centre(self, node):
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _fits_centre(self, node):
+        """True if every live cell is inside the central quarter-width square."""
+        inner = self._centre(self._centre(node))
+        return inner.population == node.population
+
+    # ---- evolution ----
+    def _life_4x4(self, node):
+        """Centre 2x2 of a 4x4 node after one generation."""
+        cells = [[0] * 4 for _ in range(4)]
+        for qy, qx, q in ((0, 0, node.nw), (0, 2, node.ne), (2, 0, node.sw), (2, 2, node.se)):
+            cells[qy][qx] = q.nw.population
+            cells[qy][qx + 1] = q.ne.population
+            cells[qy + 1][qx] = q.sw.population
+            cells[qy + 1][qx + 1] = q.se.population
+
+        out = []
+        for y in (1, 2):
+            for x in (1, 2):
+                n = sum(cells[y + dy][x + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1)) - cells[y][x]
+                out.append(ALIVE if n == 3 or (n == 2 and cells[y][x]) else DEAD)
+        return self.join(*out)
+
+    def _successor(self, node, j):
+        """Centre of ``node`` (one level down) advanced 2**j generations, j <= level - 2."""
+        if node.population == 0:
+            return node.nw
+        if node.results is not None and j in node.results:
+            self.memo_hits += 1
+            return node.results[j]
+        self.memo_misses += 1
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            a, b, c, d = node.nw, node.ne, node.sw, node.se
+            join = self.join
+            # the nine overlapping sub-squares of half size
+            n00 = a
+            n01 = join(a.ne, b.nw, a.se, b.sw)
+            n02 = b
+            n10 = join(a.sw, a.se, c.nw, c.ne)
+            n11 = join(a.se, b.sw, c.ne, d.nw)
+            n12 = join(b.sw, b.se, d.nw, d.ne)
+            n20 = c
+            n21 = join(c.ne, d.nw, c.se, d.sw)
+            n22 = d
+
+            if j < node.level - 2:
+                # advance the full 2**j in the first round, then just take centres
+                r = [self._successor(n, j) for n in (n00, n01, n02, n10, n11, n12, n20, n21, n22)]
+                result = join(
+                    join(r[0].se, r[1].sw, r[3].ne, r[4].nw),
+                    join(r[1].se, r[2].sw, r[4].ne, r[5].nw),
+                    join(r[3].se, r[4].sw, r[6].ne, r[7].nw),
+                    join(r[4].se, r[5].sw, r[7].ne, r[8].nw),
+                )
+            else:
+                # two rounds of 2**(level - 3) each
+                r = [self._successor(n, j - 1) for n in (n00, n01, n02, n10, n11, n12, n20, n21, n22)]
+                result = join(
+                    self._successor(join(r[0], r[1], r[3], r[4]), j - 1),
+                    self._successor(join(r[1], r[2], r[4], r[5]), j - 1),
+                    self._successor(join(r[3], r[4], r[6], r[7]), j - 1),
+                    self._successor(join(r[4], r[5], r[7], r[8]), j - 1),
+                )
+
+        if node.results is None:
+            node.results = {}
+        node.results[j] = result
+        return result
+
+    def advance(self, generations):
+        """Advance the universe by ``generations`` (any non-negative int)."""
+        j = 0
+        while generations:
+            if generations & 1:
+                self._advance_pow2(j)
+            generations >>= 1
+            j += 1
+
+    def jump(self, k):
+        """Advance exactly 2**k generations."""
+        self._advance_pow2(k)
+
+    def _advance_pow2(self, j):
+        if len(self.table) > self.max_nodes // 2:
+            self.collect()
+        # a single generation has to make progress even if it overshoots
+        self._bounded = j > 0
+        try:
+            root = self.root
+            # room for the pattern to grow by 2**j on every side without leaving the result
+            while root.level < j + 3 or not self._fits_centre(root):
+                root = self._expand(root)
+            result = self._successor(root, j)
+        except _CacheFull:
+            self._bounded = False
+            self.split_steps += 1
+            self.collect()
+            self._advance_pow2(j - 1)
+            self._advance_pow2(j - 1)
+            return
+        finally:
+            self._bounded = False
+        self.root = result
+        self.generation += 1 << j
+
+    # ---- cache management ----
+    def collect(self):
+        """Drop nodes that the current universe (and its cached futures) no longer use."""
+        self.gc_runs += 1
+        self._sweep(keep_results=True)
+        if len(self.table) > self.max_nodes // 2:
+            self._sweep(keep_results=False)
+
+    def _sweep(self, keep_results):
+        marked = set()
+        stack = [self.root, *self._empty]
+        while stack:
+            node = stack.pop()
+            if node.level == 0 or node in marked:
+                continue
+            marked.add(node)
+            stack.extend((node.nw, node.ne, node.sw, node.se))
+            if node.results:
+                if keep_results:
+                    stack.extend(node.results.values())
+                else:
+                    node.results = None
+        self.table = {key: node for key, node in self.table.items() if node in marked}
+
+    def stats(self):
+        lookups = self.memo_hits + self.memo_misses
+        return {
+            "generation": self.generation,
+            "population": self.root.population,
+            "root_level": self.root.level,
+            "nodes": len(self.table),
+            "memo_hits": self.memo_hits,
+            "memo_misses": self.memo_misses,
+            "hit_rate": self.memo_hits / lookups if lookups else 0.0,
+            "gc_runs": self.gc_runs,
+            "split_steps": self.split_steps,
+        }
+
+    # ---- cells ----
+    @property
+    def population(self):
+        return self.root.population
+
+    def set_cells(self, cells):
+        """Replace the universe with the given live (x, y) cells."""
+        cells = set(cells)
+        span = max((max(abs(x), abs(y)) for x, y in cells), default=0)
+        level = 3
+        while (1 << (level - 1)) <= span:
+            level += 1
+        half = 1 << (level - 1)
+        self.root = self._build(cells, level, -half, -half)
+        self.generation = 0
+
+    def _build(self, cells, level, x0, y0):
+        if not cells:
+            return self.empty(level)
+        if level == 0:
+            return ALIVE
+        half = 1 << (level - 1)
+        quads = ([], [], [], [])
+        for x, y in cells:
+            quads[(y >= y0 + half) * 2 + (x >= x0 + half)].append((x, y))
+        return self.join(
+            self._build(quads[0], level - 1, x0, y0),
+            self._build(quads[1], level - 1, x0 + half, y0),
+            self._build(quads[2], level - 1, x0, y0 + half),
+            self._build(quads[3], level - 1, x0 + half, y0 + half),
+        )
+
+    def cells(self):
+        """Live cells as (x, y) pairs."""
+        out = []
+        half = 1 << (self.root.level - 1)
+        stack = [(self.root, -half, -half)]
+        while stack:
+            node, x, y = stack.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                out.append((x, y))
+                continue
+            h = 1 << (node.level - 1)
+            stack.extend(((node.nw, x, y), (node.ne, x + h, y),
+                          (node.sw, x, y + h), (node.se, x + h, y + h)))
+        return out
+
+    def load_cgol(self, grid_size, cells):
+        """Load CGOL.c-style input: ``cells`` are (X, Y) = (row, col) inside a grid_size board."""
+        cells = list(cells)
+        for row, col in cells:
+            if not (0 <= row < grid_size and 0 <= col < grid_size):
+                raise ValueError(f"cell {row} {col} is outside a {grid_size}x{grid_size} grid")
+        self.set_cells((col, row) for row, col in cells)
+
+    def render(self, x0, y0, width, height, alive="#", dead="."):
+        """Text picture of a window in CGOL.c's style."""
+        live = {(x, y) for x, y in self.cells() if x0 <= x < x0 + width and y0 <= y < y0 + height}
+        return "\n".join(
+            " ".join(alive if (x, y) in live else dead for x in range(x0, x0 + width)) + " "
+            for y in range(y0, y0 + height)
+        )
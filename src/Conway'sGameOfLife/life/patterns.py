@@ -0,0 +1,116 @@
+def parse_cgol(text):
+    """Parse the answers CGOL.c asks for: grid size, live cell count, X Y pairs, generations.
+
+    Returns ``(grid_size, cells, generations)`` with ``cells`` as (row, col)
+    pairs, which is how CGOL.c uses X and Y. The generation count is
+    optional and comes back as None when missing.
+    """
+    numbers = [int(tok) for tok in text.split()]
+    if len(numbers) < 2:
+        raise ValueError("expected grid size and live cell count")
+    grid_size, count = numbers[0], numbers[1]
+    coords = numbers[2:2 + 2 * count]
+    if len(coords) < 2 * count:
+        raise ValueError(f"expected {count} X Y pairs, got {len(coords) // 2}")
+    cells = list(zip(coords[0::2], coords[1::2]))
+    for x, y in cells:
+        if not (0 <= x < grid_size and 0 <= y < grid_size):
+            raise ValueError(f"cell {x} {y} is outside a {grid_size}x{grid_size} grid")
+    rest = numbers[2 + 2 * count:]
+    return grid_size, cells, rest[0] if rest else None
+
+
+# Gosper glider gun as CGOL.c-style (X, Y) = (row, col) cells; needs a grid of at least 36.
+GOSPER_GUN = [
+    (0, 24), (1, 22), (1, 24), (2, 12), (2, 13), (2, 20), (2, 21), (2, 34), (2, 35),
+    (3, 11), (3, 15), (3, 20), (3, 21), (3, 34), (3, 35), (4, 0), (4, 1), (4, 10),
+    (4, 16), (4, 20), (4, 21), (5, 0), (5, 1), (5, 10), (5, 14), (5, 16), (5, 17),
+    (5, 22), (5, 24), (6, 10), (6, 16), (6, 24), (7, 11), (7, 15), (8, 12), (8, 13),
+]
+
+
+# ---------- RLE ----------
+# The usual Life pattern format: a header "x = W, y = H, rule = B3/S23",
+# then runs like "3o2b$" (o alive, b dead, $ end of row) up to "!".
+RLE_LINE = 70
+
+
+def read_rle(lines):
+    """Yield the live (x, y) cells of an RLE pattern, reading ``lines`` (e.g. a file) lazily."""
+    x = y = 0
+    count = ""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("x"):
+            for field in line.split(","):
+                key, _, value = field.partition("=")
+                if key.strip() == "rule" and value.strip().upper() not in ("B3/S23", "23/3"):
+                    raise ValueError(f"only B3/S23 patterns are supported, not {value.strip()}")
+            continue
+        for ch in line:
+            if ch.isdigit():
+                count += ch
+                continue
+            run = int(count) if count else 1
+            count = ""
+            if ch == "b" or ch == ".":
+                x += run
+            elif ch == "$":
+                x = 0
+                y += run
+            elif ch == "!":
+                return
+            elif ch.isalpha():
+                for i in range(run):
+                    yield x + i, y
+                x += run
+            elif not ch.isspace():
+                raise ValueError(f"unexpected {ch!r} in RLE data")
+
+
+def write_rle(out, rows, width, height, comment=None):
+    """Write an RLE pattern to the text stream ``out``.
+
+    ``rows`` yields ``(y, xs)`` with rows in increasing order and each ``xs``
+    sorted, so a pattern can be written without holding it all in memory.
+    """
+    if comment:
+        out.write(f"#C {comment}\n")
+    out.write(f"x = {width}, y = {height}, rule = B3/S23\n")
+
+    line = []
+    length = 0
+
+    def emit(run, tag):
+        nonlocal length
+        token = f"{run}{tag}" if run > 1 else tag
+        if length + len(token) > RLE_LINE:
+            out.write("".join(line) + "\n")
+            line.clear()
+            length = 0
+        line.append(token)
+        length += len(token)
+
+    last_y = 0
+    for y, xs in rows:
+        if y > last_y:
+            emit(y - last_y, "$")
+        last_y = y
+        x = 0
+        start = prev = None
+        for cx in map(int, xs):
+            if start is not None and cx == prev + 1:
+                prev = cx
+                continue
+            if start is not None:
+                emit(prev - start + 1, "o")
+                x = prev + 1
+            if cx > x:
+                emit(cx - x, "b")
+            start = prev = cx
+        if start is not None:
+            emit(prev - start + 1, "o")
+    emit(1, "!")
+    out.write("".join(line) + "\n")
@@ -1,18 +1,29 @@
-import pygame
 import math
 import random
+import time
+
+from frameProfiler import FrameProfiler
+from spatialGrid import SpatialGrid
 
 # ------------------ SETUP ------------------
-pygame.init()
 WIDTH, HEIGHT = 900, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Gravity Ball Simulator")
-clock = pygame.time.Clock()
 
 GRAVITY = 1200
 BOUNCE = 0.9
 BG_COLOR = (25, 25, 30)
 
+PHYSICS_HZ = 60          # fixed physics steps per second, independent of the frame rate
+SUBSTEPS = 2             # substeps per physics step
+MAX_FRAME_DT = 0.25      # longest frame fed to the accumulator (a hitch just slows time)
+MAX_STEPS = 4            # physics steps per frame; when behind, slow down instead of spiralling
+MAX_WALL_HITS = 4        # wall bounces resolved per ball per substep
+
+GRID_CELL = 16           # a little over a sprayed ball; big balls span a few cells
+SPRAY_RATE = 200         # balls per frame while spraying
+MAX_BALLS = 3000         # spraying stops here, with a notice
+SPRAY_RADIUS = 40
+SPRAY_BALL_RADIUS = 4
+
 # ------------------ BALL CLASS ------------------
 class Ball:
     def __init__(self, x, y, radius=15):
@@ -22,14 +33,56 @@ class Ball:
         self.mass = radius * radius
         self.vx = 0
         self.vy = 0
+        self.prev_x = x  # position at the previous physics step, for interpolation
+        self.prev_y = y
         self.color = (
             random.randint(0, 255),
             random.randint(0, 255),
             random.randint(0, 255)
         )
 
-    def update(self, dt):
-        self.vy += GRAVITY * dt
+    def wall_time(self, dt, gravity=0):
+        """Earliest time within ``dt`` at which the ball touches a wall it moves towards, and which axis."""
+        best, axis = None, None
+        r = self.radius
+        for t, a in (
+            (contact_time(self.x - r, -self.vx, 0), 0),
+            (contact_time(WIDTH - r - self.x, self.vx, 0), 0),
+            (contact_time(self.y - r, -self.vy, -gravity), 1),
+            (contact_time(HEIGHT - r - self.y, self.vy, gravity), 1),
+        ):
+            if t is not None and t <= dt and (best is None or t < best):
+                best, axis = t, a
+        return best, axis
+
+    def fly(self, dt, gravity=0):
+        # exact for constant gravity, so the step size does not change the path
+        self.x += self.vx * dt
+        self.y += (self.vy + gravity * dt / 2) * dt
+        self.vy += gravity * dt
+
+    def advance(self, dt, gravity=0):
+        """Move for ``dt`` seconds under ``gravity``, bouncing off the walls at the exact time of impact."""
+        r = self.radius
+        reach = r + (abs(self.vx) + abs(self.vy) + gravity * dt) * dt
+        if reach < self.x < WIDTH - reach and reach < self.y < HEIGHT - reach:
+            self.fly(dt, gravity)  # no wall within reach this time
+            return
+        for _ in range(MAX_WALL_HITS):
+            t, axis = self.wall_time(dt, gravity)
+            if t is None:
+                break
+            self.fly(t, gravity)
+            if axis == 0:
+                self.vx *= -BOUNCE
+            else:
+                self.vy *= -BOUNCE
+            dt -= t
+        self.fly(dt, gravity)
+        self.wall_collision()
+
+    def move_discrete(self, dt):
+        # the old integration: move, then push back inside
         self.x += self.vx * dt
         self.y += self.vy * dt
         self.wall_collision()
@@ -51,14 +104,36 @@ class Ball:
             self.y = HEIGHT - self.radius
             self.vy *= -BOUNCE
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        import pygame
+
+        # alpha blends from the previous physics state (0) to the current one (1)
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
         pygame.draw.circle(
             screen,
             self.color,
-            (int(self.x), int(self.y)),
+            (int(x), int(y)),
             self.radius
         )
 
+def contact_time(gap, speed, accel):
+    """First time at which ``speed * t + accel * t * t / 2`` covers ``gap``, or None if it never does.
+
+    ``gap`` is the distance to a wall (zero or less when touching it),
+    ``speed`` and ``accel`` are measured towards the wall.
+    """
+    if gap <= 0:
+        if speed > 0 or (speed == 0 and accel > 0):
+            return 0.0
+        # moving away: back only if pulled towards the wall
+        return -2 * speed / accel if speed < 0 and accel > 0 else None
+    disc = speed * speed + 2 * accel * gap
+    if disc < 0:
+        return None
+    root = speed + math.sqrt(disc)
+    return 2 * gap / root if root > 0 else None
+
 # ------------------ COLLISIONS ------------------
 def ball_collision(b1, b2):
     dx = b2.x - b1.x
@@ -78,74 +153,354 @@ def ball_collision(b1, b2):
         b2.x += nx * overlap / 2
         b2.y += ny * overlap / 2
 
-        dvx = b2.vx - b1.vx
-        dvy = b2.vy - b1.vy
-        dot = dvx * nx + dvy * ny
+        bounce(b1, b2, nx, ny)
 
-        if dot > 0:
-            return
+def bounce(b1, b2, nx, ny):
+    """Elastic impulse along the unit normal (nx, ny) from b1 to b2, if they are approaching."""
+    dvx = b2.vx - b1.vx
+    dvy = b2.vy - b1.vy
+    dot = dvx * nx + dvy * ny
+
+    if dot > 0:
+        return
+
+    impulse = (2 * dot) / (b1.mass + b2.mass)
+    b1.vx += impulse * b2.mass * nx
+    b1.vy += impulse * b2.mass * ny
+    b2.vx -= impulse * b1.mass * nx
+    b2.vy -= impulse * b1.mass * ny
+
+def bounce_off(ball, nx, ny):
+    """Elastic bounce off something immovable along the unit normal (nx, ny) from the ball to it."""
+    dot = ball.vx * nx + ball.vy * ny
+    if dot <= 0:
+        return
+    ball.vx -= 2 * dot * nx
+    ball.vy -= 2 * dot * ny
+
+def collide_all(balls, grid):
+    """Resolve every touching pair, using the grid to skip pairs that are far apart."""
+    grid.rebuild(balls)
+    for b1, b2 in grid.pairs():
+        ball_collision(b1, b2)
+
+# ------------------ CONTINUOUS COLLISIONS ------------------
+class Sweep:
+    """Circle around the path a ball covers in one substep, for the broad phase."""
+    __slots__ = ("ball", "x", "y", "radius")
+
+    def __init__(self, ball, dt, gravity=0):
+        self.ball = ball
+        self.x = ball.x + ball.vx * dt / 2
+        self.y = ball.y + ball.vy * dt / 2
+        # the fall bends the path off the straight line by less than gravity * dt**2 / 2
+        self.radius = ball.radius + math.hypot(ball.vx, ball.vy) * dt / 2 + gravity * dt * dt / 2
+
+def time_of_impact(b1, b2, dt):
+    """First time in [0, dt] at which two balls touch, or None.
+
+    Exact for balls under the same gravity, whose relative motion is a
+    straight line; against the held ball it ignores the fall of the other.
+    """
+    dx = b2.x - b1.x
+    dy = b2.y - b1.y
+    wx = b2.vx - b1.vx
+    wy = b2.vy - b1.vy
+    reach = b1.radius + b2.radius
+    c = dx * dx + dy * dy - reach * reach
+    b = dx * wx + dy * wy
+    if b >= 0:
+        return None  # not approaching
+    if c <= 0:
+        return 0.0  # already touching
+    a = wx * wx + wy * wy
+    disc = b * b - a * c
+    if disc < 0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= dt else None
 
-        impulse = (2 * dot) / (b1.mass + b2.mass)
-        b1.vx += impulse * b2.mass * nx
-        b1.vy += impulse * b2.mass * ny
-        b2.vx -= impulse * b1.mass * nx
-        b2.vy -= impulse * b1.mass * ny
+def swept_collisions(balls, grid, dt, gravity=0, held=None):
+    """Move every ball by ``dt``, bouncing fast ones at their time of impact instead of after overlap.
+
+    Only balls that move further than their radius in ``dt`` can pass
+    through another, so only they are swept; the held ball is an
+    immovable target. Each ball takes part in at most one (the earliest)
+    impact per substep; anything left over is caught by the next substep
+    or the overlap pass.
+    """
+    fast = [b for b in balls if b is not held and math.hypot(b.vx, b.vy) * dt > b.radius]
+    moved = {}
+    if fast:
+        largest = max(b.radius for b in balls) + gravity * dt * dt / 2
+        grid.rebuild(balls)
+        impacts = []
+        checked = set()  # fast pairs, which either ball's query can find
+        for b1 in fast:
+            s = Sweep(b1, dt, gravity)
+            # the query starts from where the others are now, so widen it by the furthest a ball
+            # that b1 has to find can travel: a slow one moves less than its radius, and a faster
+            # one finds b1 itself
+            slack = max(largest, math.hypot(b1.vx, b1.vy) * dt)
+            for b2 in grid.query_radius(s.x, s.y, s.radius + slack):
+                if b2 is b1:
+                    continue
+                key = (id(b1), id(b2)) if id(b1) < id(b2) else (id(b2), id(b1))
+                if key in checked:
+                    continue
+                checked.add(key)
+                t = time_of_impact(b1, b2, dt)
+                if t is not None:
+                    impacts.append((t, b1, b2))
+        impacts.sort(key=lambda impact: impact[0])
+
+        for t, b1, b2 in impacts:
+            if b1 in moved or b2 in moved:
+                continue
+            b1.advance(t, gravity)
+            if b2 is not held:
+                b2.advance(t, gravity)
+            dist = math.hypot(b2.x - b1.x, b2.y - b1.y)
+            if dist > 0:
+                nx, ny = (b2.x - b1.x) / dist, (b2.y - b1.y) / dist
+                if b2 is held:
+                    bounce_off(b1, nx, ny)
+                else:
+                    bounce(b1, b2, nx, ny)
+            moved[b1] = t
+            if b2 is not held:
+                moved[b2] = t
+
+    for b in balls:
+        if b is not held:
+            b.advance(dt - moved.get(b, 0.0), gravity)
+
+def physics_step(balls, grid, dt, substeps=SUBSTEPS, ccd=True, gravity=GRAVITY, held=None):
+    """One fixed step of ``dt`` seconds split into ``substeps``; ``held`` (the dragged ball) does not move."""
+    for b in balls:
+        b.prev_x, b.prev_y = b.x, b.y
+    h = dt / substeps
+    for _ in range(substeps):
+        if ccd:
+            swept_collisions(balls, grid, h, gravity, held)
+        else:
+            for b in balls:
+                if b is not held:
+                    b.vy += gravity * h
+                    b.move_discrete(h)
+        # resting contacts and anything the sweep left overlapping
+        collide_all(balls, grid)
+
+# ------------------ SPRAY ------------------
+def spray(x, y, count=SPRAY_RATE):
+    """A batch of small balls scattered in a disc around (x, y)."""
+    batch = []
+    for _ in range(count):
+        angle = random.uniform(0, 2 * math.pi)
+        dist = SPRAY_RADIUS * math.sqrt(random.random())
+        batch.append(Ball(x + dist * math.cos(angle), y + dist * math.sin(angle), SPRAY_BALL_RADIUS))
+    return batch
+
+# ------------------ BENCHMARK ------------------
+def _drop_error(substeps, ccd, dt):
+    # rebound height of a dropped ball against the exact 0.81 (BOUNCE**2) of the drop height
+    ball = Ball(WIDTH / 2, 100)
+    grid = SpatialGrid(GRID_CELL)
+    drop = HEIGHT - ball.radius - ball.y
+    bounced = False
+    top = HEIGHT
+    for _ in range(int(5 / dt)):
+        physics_step([ball], grid, dt, substeps, ccd)
+        if ball.vy < 0:
+            bounced = True
+            top = min(top, ball.y)
+        elif bounced:
+            break
+    rebound = HEIGHT - ball.radius - top
+    return abs(rebound - BOUNCE ** 2 * drop) / (BOUNCE ** 2 * drop)
+
+def _bullet_hits(substeps, ccd, dt, shots=200):
+    # fast balls fired straight at a resting one: how many hit it on the way past
+    rng = random.Random(1)
+    grid = SpatialGrid(GRID_CELL)
+    hits = 0
+    for _ in range(shots):
+        speed = rng.uniform(1000, 8000)
+        angle = rng.uniform(-0.3, 0.3)
+        bullet = Ball(60, HEIGHT / 2, rng.choice((4, 15)))
+        bullet.vx, bullet.vy = speed * math.cos(angle), speed * math.sin(angle)
+        gap = rng.uniform(150, 600)
+        target = Ball(bullet.x + gap * math.cos(angle), bullet.y + gap * math.sin(angle))
+        # stop once the bullet is past the target so a wall rebound cannot count as a hit
+        passed = gap + bullet.radius + target.radius
+        for _ in range(int(1 / dt)):
+            physics_step([bullet, target], grid, dt, substeps, ccd, gravity=0)
+            hit = target.vx != 0 or target.vy != 0
+            if hit or math.hypot(bullet.x - 60, bullet.y - HEIGHT / 2) > passed:
+                break
+        hits += hit
+    return hits / shots
+
+def _crossing_hits(substeps, ccd, dt, shots=200):
+    # two fast balls on crossing paths, timed to reach the same point together: how many bounce
+    rng = random.Random(3)
+    grid = SpatialGrid(GRID_CELL)
+    hits = 0
+    for shot in range(shots):
+        meet = rng.uniform(0.015, 0.035)  # seconds until both centres are on the crossing point
+        pair = []
+        for angle in (rng.uniform(-0.3, 0.3), math.pi / 2 + rng.uniform(-0.3, 0.3)):
+            speed = rng.uniform(1000, 8000)
+            b = Ball(WIDTH / 2 - speed * meet * math.cos(angle), HEIGHT / 2 - speed * meet * math.sin(angle),
+                     rng.choice((4, 15)))
+            b.vx, b.vy = speed * math.cos(angle), speed * math.sin(angle)
+            pair.append(b)
+        if shot % 2:
+            pair.reverse()  # the result must not depend on the order of the list
+        start = [(b.vx, b.vy) for b in pair]
+        # stop just past the crossing, before either ball can reach a wall
+        for _ in range(int(meet / dt) + 2):
+            physics_step(pair, grid, dt, substeps, ccd, gravity=0)
+        hits += any((b.vx, b.vy) != v for b, v in zip(pair, start))
+    return hits / shots
+
+def _scene_cost(substeps, ccd, dt, count=300, seconds=1.0):
+    rng = random.Random(2)
+    balls = []
+    for _ in range(count):
+        b = Ball(rng.uniform(20, WIDTH - 20), rng.uniform(20, HEIGHT - 20), rng.choice((4, 8, 15)))
+        b.vx, b.vy = rng.uniform(-2000, 2000), rng.uniform(-2000, 2000)
+        balls.append(b)
+    grid = SpatialGrid(GRID_CELL)
+    start = time.perf_counter()
+    for _ in range(int(seconds / dt)):
+        physics_step(balls, grid, dt, substeps, ccd)
+    return (time.perf_counter() - start) / seconds * 1000
+
+def bench(hz=PHYSICS_HZ):
+    """Print cost against accuracy for several substep counts, with and without time of impact."""
+    dt = 1 / hz
+    print(f"{hz} Hz physics; cost = ms per simulated second of a 300-ball scene")
+    print(f"{'mode':<10}{'substeps':>9}{'cost ms':>10}{'bullet hits':>13}{'crossing hits':>15}{'rebound err':>13}")
+    for ccd in (False, True):
+        for substeps in (1, 2, 4, 8, 16):
+            cost = _scene_cost(substeps, ccd, dt)
+            hits = _bullet_hits(substeps, ccd, dt)
+            crossing = _crossing_hits(substeps, ccd, dt)
+            err = _drop_error(substeps, ccd, dt)
+            print(f"{'swept' if ccd else 'discrete':<10}{substeps:>9}{cost:>10.1f}{hits:>12.0%}"
+                  f"{crossing:>14.0%}{err:>13.2%}")
 
 # ------------------ MAIN LOOP ------------------
-balls = []
-selected_ball = None
-prev_mouse = (0, 0)
+def main(argv=None):
+    import argparse
 
-running = True
-while running:
-    dt = clock.tick(60) / 1000
-    screen.fill(BG_COLOR)
+    parser = argparse.ArgumentParser(description="Gravity Ball Simulator")
+    parser.add_argument("--substeps", type=int, default=SUBSTEPS, help="substeps per physics step")
+    parser.add_argument("--hz", type=int, default=PHYSICS_HZ, help="physics steps per second")
+    parser.add_argument("--discrete", action="store_true",
+                        help="overlap checks only, no time of impact (the old behaviour)")
+    parser.add_argument("--bench", action="store_true", help="print substep cost against accuracy and exit")
+    args = parser.parse_args(argv)
+    if args.bench:
+        bench(args.hz)
+        return
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+    import pygame
 
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            mx, my = pygame.mouse.get_pos()
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Gravity Ball Simulator")
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 24)
 
-            if event.button == 1:  # left click → drag
-                for ball in reversed(balls):
-                    if math.hypot(ball.x - mx, ball.y - my) < ball.radius:
-                        selected_ball = ball
-                        prev_mouse = (mx, my)
-                        break
+    balls = []
+    pending = []  # spawned this frame, added at the next step
+    grid = SpatialGrid(GRID_CELL)
+    selected_ball = None
+    prev_mouse = (0, 0)
+    spraying = False
+    step = 1 / args.hz
+    accumulator = 0.0
+    profiler = FrameProfiler("balls")
 
-            if event.button == 3:  # right click → spawn
-                balls.append(Ball(mx, my))
+    running = True
+    while running:
+        accumulator += min(clock.tick(60) / 1000, MAX_FRAME_DT)
+        profiler.mark("tick")
+        profiler.end_frame()
+        screen.fill(BG_COLOR)
 
-        if event.type == pygame.MOUSEBUTTONUP:
-            if event.button == 1 and selected_ball:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            profiler.handle_event(event)
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
                 mx, my = pygame.mouse.get_pos()
-                dx = mx - prev_mouse[0]
-                dy = my - prev_mouse[1]
-                selected_ball.vx = dx * 8
-                selected_ball.vy = dy * 8
-                selected_ball = None
-
-    if selected_ball:
-        mx, my = pygame.mouse.get_pos()
-        selected_ball.x = mx
-        selected_ball.y = my
-        selected_ball.vx = 0
-        selected_ball.vy = 0
-        prev_mouse = (mx, my)
-
-    for ball in balls:
-        if ball != selected_ball:
-            ball.update(dt)
-
-    for i in range(len(balls)):
-        for j in range(i + 1, len(balls)):
-            ball_collision(balls[i], balls[j])
-
-    for ball in balls:
-        ball.draw(screen)
-
-    pygame.display.flip()
-
-pygame.quit()
+
+                if event.button == 1:  # left click → drag
+                    selected_ball = grid.pick(mx, my)
+                    prev_mouse = (mx, my)
+
+                # middle or shift + right drag → spray
+                if event.button == 2 or (event.button == 3 and pygame.key.get_mods() & pygame.KMOD_SHIFT):
+                    spraying = True
+                elif event.button == 3:  # right click → spawn
+                    pending.append(Ball(mx, my))
+
+            if event.type == pygame.MOUSEBUTTONUP:
+                if event.button in (2, 3):
+                    spraying = False
+                if event.button == 1 and selected_ball:
+                    mx, my = pygame.mouse.get_pos()
+                    dx = mx - prev_mouse[0]
+                    dy = my - prev_mouse[1]
+                    selected_ball.vx = dx * 8
+                    selected_ball.vy = dy * 8
+                    selected_ball = None
+
+        if selected_ball:
+            mx, my = pygame.mouse.get_pos()
+            selected_ball.x = mx
+            selected_ball.y = my
+            selected_ball.prev_x = mx
+            selected_ball.prev_y = my
+            selected_ball.vx = 0
+            selected_ball.vy = 0
+            prev_mouse = (mx, my)
+        room = MAX_BALLS - len(balls) - len(pending)
+        spray_full = spraying and room <= 0
+        if spraying and room > 0:
+            pending.extend(spray(*pygame.mouse.get_pos(), min(SPRAY_RATE, room)))
+        profiler.mark("events")
+
+        if pending:
+            balls.extend(pending)
+            pending.clear()
+        # whole fixed steps only; the remainder carries over and is used to interpolate
+        steps = 0
+        while accumulator >= step and steps < MAX_STEPS:
+            physics_step(balls, grid, step, args.substeps, not args.discrete, held=selected_ball)
+            accumulator -= step
+            steps += 1
+        accumulator = min(accumulator, step)  # drop what could not be caught up
+        profiler.mark("physics")
+
+        alpha = accumulator / step
+        for ball in balls:
+            ball.draw(screen, alpha)
+        if spray_full:
+            notice = font.render(f"Ball limit reached ({MAX_BALLS})", True, (255, 120, 120))
+            screen.blit(notice, (10, HEIGHT - 30))
+        profiler.draw(screen)
+        profiler.mark("draw")
+
+        pygame.display.flip()
+        profiler.mark("flip")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
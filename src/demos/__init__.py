@@ -0,0 +1,78 @@
+"""Launcher for the demos in src/.
+
+Nothing here imports pygame or NumPy: a demo's module is only imported
+when it is run (or asked for with ``import_demo``), and the demos
+themselves only open a window and load assets inside ``main()``.
+"""
+import importlib.util
+import os
+import runpy
+import sys
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Demo:
+    """A runnable script (``path``) or package (``module`` inside ``path``)."""
+
+    def __init__(self, path, description, module=None):
+        self.path = path
+        self.description = description
+        self.module = module
+
+    @property
+    def file(self):
+        return os.path.join(SRC_DIR, self.path)
+
+    @property
+    def directory(self):
+        return self.file if self.module else os.path.dirname(self.file)
+
+
+DEMOS = {
+    "pong": Demo("pong.py", "Smooth Pong against the AI (--net left|right for two players)"),
+    "pong-netplay": Demo("pongNetplay.py", "rollback netplay loopback test"),
+    "pong-vecenv": Demo("pongVecEnv.py", "vectorised Pong benchmark (--check: parity with pong.py)"),
+    "balls": Demo("balls.py", "gravity ball simulator"),
+    "gravity": Demo("gravityDemo.py", "gravity sandbox with merging planets"),
+    "solar": Demo("solarSystemDemo.py", "Sun, Earth and Mars"),
+    "3d": Demo(os.path.join("3dRenderer", "3dRenderer.py"), "raycasting renderer (--map, --adaptive)"),
+    "maps": Demo(os.path.join("3dRenderer", "mapLoader.py"), "generate or benchmark 3dRenderer levels"),
+    "life": Demo("Conway'sGameOfLife", "Game of Life engines (BitBoard, HashLife, chunked)", module="life"),
+    "julia": Demo("juliaSet.py", "ASCII Julia set"),
+    "fibonacci": Demo("fibbVisual.py", "Fibonacci colour stream"),
+    "headless": Demo("headlessRunner.py", "run a demo without a window and time it"),
+}
+
+
+def _add_path(directory):
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+
+
+def import_demo(name):
+    """Import a demo's module without running it, e.g. to reuse its physics."""
+    demo = DEMOS[name]
+    _add_path(demo.directory)
+    if demo.module:
+        return importlib.import_module(demo.module)
+
+    module_name = os.path.splitext(os.path.basename(demo.path))[0]
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, demo.file)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(name, argv=()):
+    """Run a demo as if it had been started with ``python <script> *argv``."""
+    demo = DEMOS[name]
+    _add_path(demo.directory)
+    sys.argv = [demo.file, *argv]
+    if demo.module:
+        runpy.run_module(demo.module, run_name="__main__", alter_sys=True)
+    else:
+        runpy.run_path(demo.file, run_name="__main__")
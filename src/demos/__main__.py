@@ -0,0 +1,90 @@
+import os
+import sys
+
+from . import DEMOS, SRC_DIR, run
+
+# run in a fresh interpreter by --startup: import one demo and report what it set up
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import demos
+demos.import_demo(sys.argv[1])
+elapsed = time.perf_counter() - start
+pygame = sys.modules.get("pygame")
+print(elapsed * 1000, int(pygame is not None), int(bool(pygame and pygame.display.get_init())),
+      int(bool(pygame and pygame.get_init())))
+"""
+
+
+def list_demos():
+    width = max(len(name) for name in DEMOS)
+    for name, demo in DEMOS.items():
+        print(f"  {name:<{width}}  {demo.description}")
+
+
+def _median_ms(cmd, repeat, env):
+    import statistics
+    import subprocess
+    import time
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=SRC_DIR, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def measure_startup(repeat):
+    """Time the launcher against a bare interpreter, then import every demo without running it."""
+    import subprocess
+
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    bare = _median_ms([sys.executable, "-c", "pass"], repeat, env)
+    launcher = _median_ms([sys.executable, "-m", "demos", "list"], repeat, env)
+    print(f"python -c pass:        {bare:7.1f} ms")
+    print(f"python -m demos list:  {launcher:7.1f} ms  (+{launcher - bare:.1f} ms)")
+    print()
+    print(f"  {'demo':<14}{'import ms':>10}  side effects")
+    for name in DEMOS:
+        out = subprocess.run([sys.executable, "-c", PROBE, name], cwd=SRC_DIR, env=env,
+                             capture_output=True, text=True)
+        if out.returncode:
+            print(f"  {name:<14}{'failed':>10}  {out.stderr.strip().splitlines()[-1]}")
+            continue
+        ms, imported, display, init = out.stdout.split()
+        flags = ((imported, "imports pygame"), (display, "display"), (init, "pygame.init"))
+        effects = ", ".join(label for flag, label in flags if flag == "1")
+        print(f"  {name:<14}{float(ms):10.1f}  {effects or 'none'}")
+
+
+def main(argv):
+    # fast paths: hand straight over to the demo (or list them) without loading anything else
+    if argv and argv[0] in DEMOS:
+        run(argv[0], argv[1:])
+        return
+    if argv in ([], ["list"]):
+        list_demos()
+        return
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m demos",
+        description="Run one of the demos; anything after the name is passed on to it.",
+    )
+    parser.add_argument("name", nargs="?", help="demo to run, or 'list' (the default)")
+    parser.add_argument("--startup", action="store_true", help="measure launcher and demo import times")
+    parser.add_argument("--repeat", type=int, default=10, help="runs per timing with --startup")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        measure_startup(args.repeat)
+    elif args.name in (None, "list"):
+        list_demos()
+    else:
+        parser.error(f"unknown demo {args.name!r}; try 'python -m demos list'")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
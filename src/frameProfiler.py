@@ -0,0 +1,188 @@
+import csv
+import json
+import math
+import time
+from collections import deque
+from time import perf_counter_ns
+
+# =====================
+# SETTINGS
+# =====================
+WINDOW = 300            # frames kept for the rolling statistics
+HISTORY = 60 * 60 * 10  # frames kept for export (10 minutes at 60 fps)
+REFRESH_FRAMES = 15     # overlay text is rebuilt every N frames
+TOGGLE_KEY = "K_F3"     # pygame key names, looked up when pygame is in use
+EXPORT_KEY = "K_F4"
+OVERLAY_BG = (0, 0, 0, 170)
+OVERLAY_FG = (230, 230, 230)
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+# =====================
+# PROFILER
+# =====================
+class FrameProfiler:
+    """Times the phases of a pygame main loop.
+
+    Call ``mark(name)`` at the end of each phase (the time since the previous
+    mark is booked under ``name``) and ``end_frame()`` once per iteration.
+    F3 toggles the overlay, F4 writes CSV + JSON of the last ``history``
+    frames to the working directory.
+
+        for event in pygame.event.get():
+            profiler.handle_event(event)
+            ...
+        profiler.mark("events")
+        update()
+        profiler.mark("update")
+        draw()
+        profiler.draw(screen)
+        profiler.mark("draw")
+        pygame.display.flip()
+        profiler.mark("flip")
+        clock.tick(FPS)
+        profiler.mark("tick")
+        profiler.end_frame()
+    """
+
+    def __init__(self, name, window=WINDOW, visible=False, keep_history=True, history=HISTORY):
+        self.name = name
+        self.visible = visible
+        self.keep_history = keep_history
+
+        self.phases = []                    # phase names in first-seen order
+        self.frame_ns = deque(maxlen=window)
+        self.phase_ns = {}                  # name -> deque of ns per frame
+        self.history = deque(maxlen=history)  # (frame, total_ns, {phase: ns}) for export
+
+        self.frame_index = 0
+        self.current = {}
+        self.frame_start = perf_counter_ns()
+        self.last_mark = self.frame_start
+
+        self._font = None
+        self._lines = []
+
+    # ---- timing ----
+    def begin_frame(self):
+        """Restart the current frame (only needed if there is setup work before the loop)."""
+        self.current = {}
+        self.frame_start = self.last_mark = perf_counter_ns()
+
+    def mark(self, phase):
+        now = perf_counter_ns()
+        self.current[phase] = self.current.get(phase, 0) + now - self.last_mark
+        self.last_mark = now
+
+    def end_frame(self):
+        now = perf_counter_ns()
+        total = now - self.frame_start
+        self.frame_ns.append(total)
+        for phase in self.current:
+            if phase not in self.phase_ns:
+                self.phases.append(phase)
+                self.phase_ns[phase] = deque(maxlen=self.frame_ns.maxlen)
+        for phase in self.phases:
+            self.phase_ns[phase].append(self.current.get(phase, 0))
+        if self.keep_history:
+            self.history.append((self.frame_index, total, self.current))
+
+        self.frame_index += 1
+        if self.visible and self.frame_index % REFRESH_FRAMES == 0:
+            self._lines = self._build_lines()
+
+        self.current = {}
+        self.frame_start = self.last_mark = now
+
+    # ---- statistics ----
+    def stats(self):
+        """Rolling statistics in milliseconds over the last ``window`` frames."""
+        frames = sorted(self.frame_ns)
+        result = {
+            "frames": len(frames),
+            "p50": percentile(frames, 50) / 1e6,
+            "p95": percentile(frames, 95) / 1e6,
+            "p99": percentile(frames, 99) / 1e6,
+            "phases": {},
+        }
+        for phase in self.phases:
+            values = sorted(self.phase_ns[phase])
+            result["phases"][phase] = {
+                "mean": sum(values) / len(values) / 1e6,
+                "p95": percentile(values, 95) / 1e6,
+            }
+        return result
+
+    # ---- overlay ----
+    def handle_event(self, event):
+        """Handle the profiler hotkeys. Returns True if the event was used."""
+        import pygame
+
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == getattr(pygame, TOGGLE_KEY):
+            self.visible = not self.visible
+            self._lines = self._build_lines() if self.visible else []
+            return True
+        if event.key == getattr(pygame, EXPORT_KEY):
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            self.export_csv(f"profile_{self.name}_{stamp}.csv")
+            self.export_json(f"profile_{self.name}_{stamp}.json")
+            return True
+        return False
+
+    def _build_lines(self):
+        s = self.stats()
+        fps = 1000 / s["p50"] if s["p50"] else 0
+        if self._font is None:
+            import pygame
+
+            self._font = pygame.font.Font(None, 20)
+        text = [f"frame p50 {s['p50']:.2f}  p95 {s['p95']:.2f}  p99 {s['p99']:.2f} ms  ({fps:.0f} fps)"]
+        for phase, v in s["phases"].items():
+            text.append(f"{phase:>8s}  {v['mean']:7.3f} ms  p95 {v['p95']:7.3f}")
+        return [self._font.render(line, True, OVERLAY_FG) for line in text]
+
+    def draw(self, screen, pos=(10, 10)):
+        if not self.visible or not self._lines:
+            return
+        import pygame
+
+        w = max(line.get_width() for line in self._lines) + 12
+        h = sum(line.get_height() for line in self._lines) + 10
+        bg = pygame.Surface((w, h), pygame.SRCALPHA)
+        bg.fill(OVERLAY_BG)
+        screen.blit(bg, pos)
+        y = pos[1] + 5
+        for line in self._lines:
+            screen.blit(line, (pos[0] + 6, y))
+            y += line.get_height()
+
+    # ---- export ----
+    def export_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms"] + [f"{p}_ms" for p in self.phases])
+            for frame, total, phases in self.history:
+                writer.writerow([frame, f"{total / 1e6:.4f}"]
+                                + [f"{phases.get(p, 0) / 1e6:.4f}" for p in self.phases])
+
+    def export_json(self, path):
+        data = {
+            "name": self.name,
+            "summary": self.stats(),
+            "phases": self.phases,
+            "frames": [
+                {"frame": frame, "total_ns": total, "phases_ns": phases}
+                for frame, total, phases in self.history
+            ],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1)
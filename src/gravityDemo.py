@@ -1,7 +1,11 @@
-import pygame
 import math
 import random
 
+import numpy as np
+
+from frameProfiler import FrameProfiler
+from spatialGrid import SpatialGrid
+
 # =====================
 # SETTINGS
 # =====================
@@ -14,6 +18,13 @@ BASE_MASS = 100  # Default mass for placable planets
 SOFTENING = 0.1
 MAX_TRAIL = 120
 MAX_INITIAL_SPEED = 1  # Cap the initial placement speed
+GRID_CELL = 20  # about the diameter of a BASE_MASS planet
+SPRAY_RATE = 200  # bodies per frame while spraying
+SPRAY_RADIUS = 60
+SPRAY_MASS = 4
+MAX_BODIES = 2000  # spraying stops here (with a notice); gravity is still all-pairs
+ENERGY_EVERY = FPS  # frames between energy readouts (the potential energy is all-pairs too)
+PAIR_ROWS = 64  # bodies per block of the all-pairs arrays, to keep them in cache
 
 # =====================
 # BODY
@@ -61,63 +72,107 @@ def wrap_position(b, world_w, world_h):
 # =====================
 # GRAVITY
 # =====================
+def _arrays(bodies, dtype):
+    n = len(bodies)
+    x = np.fromiter((b.x for b in bodies), dtype, n)
+    y = np.fromiter((b.y for b in bodies), dtype, n)
+    m = np.fromiter((b.mass for b in bodies), dtype, n)
+    return x, y, m
+
+def _pair_offsets(x, y, rows, world_w, world_h):
+    # offsets from bodies[rows] to every body, each across the nearer wrap
+    dx = x - x[rows, None]
+    dy = y - y[rows, None]
+    dx -= np.rint(dx * (1 / world_w)) * world_w
+    dy -= np.rint(dy * (1 / world_h)) * world_h
+    return dx, dy
+
 def compute_gravity(bodies, world_w, world_h):
-    for b in bodies:
-        b.ax = 0
-        b.ay = 0
-    for i in range(len(bodies)):
-        for j in range(i+1, len(bodies)):
-            b1 = bodies[i]
-            b2 = bodies[j]
-            dx = b2.x - b1.x
-            dy = b2.y - b1.y
-            dx -= round(dx / world_w) * world_w
-            dy -= round(dy / world_h) * world_h
-            dist_sq = dx*dx + dy*dy + SOFTENING
-            dist = math.sqrt(dist_sq)
-            force = G * b1.mass * b2.mass / dist_sq
-            fx = force * dx / dist
-            fy = force * dy / dist
-            b1.ax += fx / b1.mass
-            b1.ay += fy / b1.mass
-            b2.ax -= fx / b2.mass
-            b2.ay -= fy / b2.mass
+    """Set every body's acceleration from all the others, a block of rows at a time.
+
+    float32 is plenty for the forces and about three times faster than float64.
+    """
+    n = len(bodies)
+    if not n:
+        return
+    x, y, m = _arrays(bodies, np.float32)
+    ax = np.empty(n, np.float32)
+    ay = np.empty(n, np.float32)
+    for start in range(0, n, PAIR_ROWS):
+        rows = slice(start, start + PAIR_ROWS)
+        dx, dy = _pair_offsets(x, y, rows, world_w, world_h)
+        dist_sq = dx * dx + dy * dy + SOFTENING
+        # G * m2 / d**2 along the unit vector (dx, dy) / d; a body's own entry has dx = dy = 0
+        k = m / (dist_sq * np.sqrt(dist_sq))
+        ax[rows] = (k * dx).sum(axis=1)
+        ay[rows] = (k * dy).sum(axis=1)
+    ax *= G
+    ay *= G
+    for b, bx, by in zip(bodies, ax.tolist(), ay.tolist()):
+        b.ax = bx
+        b.ay = by
 
 # =====================
 # COLLISIONS WITH MERGING
 # =====================
+def merge(b1, b2, world_w, world_h):
+    """Fold b2 into b1, keeping momentum; the centre of mass is taken across the wrapped edges."""
+    dx = b2.x - b1.x
+    dy = b2.y - b1.y
+    dx -= round(dx / world_w) * world_w
+    dy -= round(dy / world_h) * world_h
+    total_mass = b1.mass + b2.mass
+    b1.vx = (b1.vx * b1.mass + b2.vx * b2.mass) / total_mass
+    b1.vy = (b1.vy * b1.mass + b2.vy * b2.mass) / total_mass
+    b1.x += dx * b2.mass / total_mass
+    b1.y += dy * b2.mass / total_mass
+    b1.mass = total_mass
+    b1.update_radius()
+    # merge trails
+    b1.trail.extend(b2.trail)
+    b1.trail = b1.trail[-MAX_TRAIL:]
+
+def wrap_offsets(pos, reach, size):
+    """Shifts that bring the copies of a circle reaching across the world edge back inside."""
+    offsets = [0]
+    if pos - reach < -size / 2:
+        offsets.append(size)
+    if pos + reach > size / 2:
+        offsets.append(-size)
+    return offsets
+
 def handle_collisions(bodies, world_w, world_h):
-    i = 0
-    while i < len(bodies):
-        b1 = bodies[i]
-        j = i + 1
-        while j < len(bodies):
-            b2 = bodies[j]
-            dx = b2.x - b1.x
-            dy = b2.y - b1.y
-            dx -= round(dx / world_w) * world_w
-            dy -= round(dy / world_h) * world_h
-            dist = math.hypot(dx, dy)
-            if dist < b1.radius + b2.radius:
-                # Merge planets partially
-                total_mass = b1.mass + b2.mass
-                vx = (b1.vx * b1.mass + b2.vx * b2.mass) / total_mass
-                vy = (b1.vy * b1.mass + b2.vy * b2.mass) / total_mass
-                x = (b1.x * b1.mass + b2.x * b2.mass) / total_mass
-                y = (b1.y * b1.mass + b2.y * b2.mass) / total_mass
-                b1.x = x
-                b1.y = y
-                b1.vx = vx
-                b1.vy = vy
-                b1.mass = total_mass
-                b1.update_radius()
-                # merge trails
-                b1.trail.extend(b2.trail)
-                b1.trail = b1.trail[-MAX_TRAIL:]
-                bodies.pop(j)
-            else:
-                j += 1
-        i += 1
+    """Merge overlapping bodies, earlier ones in the list absorbing later ones.
+
+    Candidates come from a SpatialGrid; a body near an edge is also looked
+    up at its wrapped positions. A body that grows is looked up again, so
+    it takes in every later body it reaches this step.
+    """
+    if len(bodies) < 2:
+        return
+    grid = SpatialGrid(GRID_CELL)
+    grid.rebuild(bodies)
+    order = {id(b): i for i, b in enumerate(bodies)}
+    largest = max(b.radius for b in bodies)
+    merged = set()
+    for i, b1 in enumerate(bodies):
+        if id(b1) in merged:
+            continue
+        grew = True
+        while grew:
+            grew = False
+            reach = b1.radius + largest
+            for ox in wrap_offsets(b1.x, reach, world_w):
+                for oy in wrap_offsets(b1.y, reach, world_h):
+                    for b2 in grid.query_radius(b1.x + ox, b1.y + oy, b1.radius):
+                        if order[id(b2)] <= i or id(b2) in merged:
+                            continue
+                        merge(b1, b2, world_w, world_h)
+                        merged.add(id(b2))
+                        grew = True
+            largest = max(largest, b1.radius)
+    if merged:
+        bodies[:] = [b for b in bodies if id(b) not in merged]
 
 # =====================
 # UPDATE
@@ -143,23 +198,23 @@ def update(bodies, world_w, world_h):
 # =====================
 def total_energy(bodies, world_w, world_h):
     KE = sum(0.5*b.mass*(b.vx**2 + b.vy**2) for b in bodies)
-    PE = 0
-    for i in range(len(bodies)):
-        for j in range(i+1, len(bodies)):
-            b1 = bodies[i]
-            b2 = bodies[j]
-            dx = b2.x - b1.x
-            dy = b2.y - b1.y
-            dx -= round(dx / world_w) * world_w
-            dy -= round(dy / world_h) * world_h
-            dist = math.hypot(dx, dy) + SOFTENING
-            PE -= G * b1.mass * b2.mass / dist
+    x, y, m = _arrays(bodies, np.float32)
+    PE = 0.0
+    for start in range(0, len(bodies), PAIR_ROWS):
+        rows = slice(start, start + PAIR_ROWS)
+        dx, dy = _pair_offsets(x, y, rows, world_w, world_h)
+        pe = m[rows, None] * m / (np.sqrt(dx * dx + dy * dy) + SOFTENING)
+        PE -= float(pe.sum(dtype=np.float64))
+    # every pair was counted from both ends, and each body once against itself at distance 0
+    PE = G * (PE + float((m.astype(np.float64) ** 2).sum()) / SOFTENING) / 2
     return KE, PE, KE+PE
 
 # =====================
 # DRAW BODY WITH TOROIDAL RENDERING
 # =====================
 def draw_body_wrapped(screen, b):
+    import pygame
+
     positions = []
     px = WIDTH//2 + int(b.x)
     py = HEIGHT//2 + int(b.y)
@@ -190,112 +245,195 @@ def draw_body_wrapped(screen, b):
     for pos in positions:
         pygame.draw.circle(screen, b.color(), pos, max(2, b.radius))
 
+# =====================
+# PICKING / SPRAY
+# =====================
+def pick_body(grid, x, y, world_w, world_h):
+    """Body under world point (x, y), also trying the wrapped copies drawn across the edges."""
+    for ox in (0, world_w, -world_w):
+        for oy in (0, world_h, -world_h):
+            b = grid.pick(x + ox, y + oy)
+            if b is not None:
+                return b
+    return None
+
+def spray(x, y, count=SPRAY_RATE):
+    """A batch of small resting bodies scattered in a disc around world point (x, y)."""
+    batch = []
+    for _ in range(count):
+        angle = random.uniform(0, 2 * math.pi)
+        dist = SPRAY_RADIUS * math.sqrt(random.random())
+        batch.append(Body(x + dist * math.cos(angle), y + dist * math.sin(angle), 0, 0, SPRAY_MASS))
+    return batch
+
 # =====================
 # MAIN
 # =====================
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Gravity Sandbox Colorful Planets")
-clock = pygame.time.Clock()
-
-bodies = []
-dragging = False
-start_pos = (0, 0)
-paused = False
-
-compute_gravity(bodies, WIDTH, HEIGHT)
-
-running = True
-while running:
-    clock.tick(FPS)
-    screen.fill((0,0,0))
-
-    # =====================
-    # EVENT HANDLING
-    # =====================
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        # Place planets
-        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            dragging = True
-            start_pos = pygame.mouse.get_pos()
-
-        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-            dragging = False
-            x0, y0 = start_pos
-            x1, y1 = pygame.mouse.get_pos()
-            x = x0 - WIDTH/2
-            y = y0 - HEIGHT/2
-
-            # --- SAFE INITIAL VELOCITY ---
-            dx = x0 - x1
-            dy = y0 - y1
-            speed = math.hypot(dx, dy) * 0.05
-            if speed > MAX_INITIAL_SPEED:
-                scale = MAX_INITIAL_SPEED / speed
-                dx *= scale
-                dy *= scale
-            vx = dx
-            vy = dy
-            # -----------------------------
-
-            bodies.append(Body(x, y, vx, vy, BASE_MASS))
-            compute_gravity(bodies, WIDTH, HEIGHT)
-
-        # Pause / step
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE:
-                paused = not paused
-            elif event.key == pygame.K_s and paused:
-                update(bodies, WIDTH, HEIGHT)
-
-    # =====================
-    # PHYSICS UPDATE
-    # =====================
-    if not paused:
-        update(bodies, WIDTH, HEIGHT)
-
-    # =====================
-    # DRAW TRAILS
-    # =====================
-    for b in bodies:
-        segment = []
-        for point in b.trail:
-            if point is None:
-                if len(segment) > 1:
-                    pygame.draw.lines(screen, (120,120,160), False, segment, 1)
-                segment = []
-            else:
-                x, y = point
-                px = WIDTH//2 + int(x)
-                py = HEIGHT//2 + int(y)
-                segment.append((px, py))
-        if len(segment) > 1:
-            pygame.draw.lines(screen, (120,120,160), False, segment, 1)
-
-    # =====================
-    # DRAW BODIES
-    # =====================
-    for b in bodies:
-        draw_body_wrapped(screen, b)
-
-    # =====================
-    # VELOCITY PREVIEW
-    # =====================
-    if dragging:
-        mx, my = pygame.mouse.get_pos()
-        pygame.draw.line(screen, (255,100,100), start_pos, (mx,my), 2)
-
-    # =====================
-    # ENERGY DISPLAY
-    # =====================
-    KE, PE, TE = total_energy(bodies, WIDTH, HEIGHT)
+def main():
+    import pygame
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Gravity Sandbox Colorful Planets")
+    clock = pygame.time.Clock()
+
+    bodies = []
+    pending = []  # placed or sprayed this frame, added in one batch
+    removing = []  # right-clicked this frame, removed in one batch
+    grid = SpatialGrid(GRID_CELL)
+    forces_stale = False  # forces are recomputed at the next step, not per placed body
+    dragging = False
+    spraying = False
+    start_pos = (0, 0)
+    paused = False
+    step_once = False
+
+    compute_gravity(bodies, WIDTH, HEIGHT)
+    profiler = FrameProfiler("gravityDemo")
     font = pygame.font.SysFont("Arial",16)
-    info = font.render(f"KE: {KE:.2f} | PE: {PE:.2f} | TE: {TE:.2f} | Mass: {BASE_MASS}", True, (255,255,255))
-    screen.blit(info, (10,10))
-
-    pygame.display.flip()
-
-pygame.quit()
+    info = None
+    frame = 0
+
+    running = True
+    while running:
+        clock.tick(FPS)
+        profiler.mark("tick")
+        profiler.end_frame()
+        screen.fill((0,0,0))
+
+        # =====================
+        # EVENT HANDLING
+        # =====================
+        for event in pygame.event.get():
+            profiler.handle_event(event)
+            if event.type == pygame.QUIT:
+                running = False
+
+            # Place planets
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                dragging = True
+                start_pos = pygame.mouse.get_pos()
+
+            # Spray (middle or shift + right drag) / remove (right click)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (2, 3):
+                if event.button == 2 or pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                    spraying = True
+                else:
+                    mx, my = pygame.mouse.get_pos()
+                    b = pick_body(grid, mx - WIDTH/2, my - HEIGHT/2, WIDTH, HEIGHT)
+                    # the grid is only rebuilt once per frame, so a second click can pick the same body
+                    if b is not None and b not in removing:
+                        removing.append(b)
+
+            elif event.type == pygame.MOUSEBUTTONUP and event.button in (2, 3):
+                spraying = False
+
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                dragging = False
+                x0, y0 = start_pos
+                x1, y1 = pygame.mouse.get_pos()
+                x = x0 - WIDTH/2
+                y = y0 - HEIGHT/2
+
+                # --- SAFE INITIAL VELOCITY ---
+                dx = x0 - x1
+                dy = y0 - y1
+                speed = math.hypot(dx, dy) * 0.05
+                if speed > MAX_INITIAL_SPEED:
+                    scale = MAX_INITIAL_SPEED / speed
+                    dx *= scale
+                    dy *= scale
+                vx = dx
+                vy = dy
+                # -----------------------------
+
+                pending.append(Body(x, y, vx, vy, BASE_MASS))
+
+            # Pause / step
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_s and paused:
+                    step_once = True
+
+        if removing:
+            gone = {id(b) for b in removing}
+            bodies[:] = [b for b in bodies if id(b) not in gone]
+            removing.clear()
+            forces_stale = True
+        room = MAX_BODIES - len(bodies) - len(pending)
+        spray_full = spraying and room <= 0
+        if spraying and room > 0:
+            mx, my = pygame.mouse.get_pos()
+            pending.extend(spray(mx - WIDTH/2, my - HEIGHT/2, min(SPRAY_RATE, room)))
+        if pending:
+            bodies.extend(pending)
+            pending.clear()
+            forces_stale = True
+        profiler.mark("events")
+
+        # =====================
+        # PHYSICS UPDATE
+        # =====================
+        if not paused or step_once:
+            if forces_stale:
+                compute_gravity(bodies, WIDTH, HEIGHT)
+                forces_stale = False
+            update(bodies, WIDTH, HEIGHT)
+            step_once = False
+        grid.rebuild(bodies)
+        profiler.mark("update")
+
+        # =====================
+        # DRAW TRAILS
+        # =====================
+        for b in bodies:
+            segment = []
+            for point in b.trail:
+                if point is None:
+                    if len(segment) > 1:
+                        pygame.draw.lines(screen, (120,120,160), False, segment, 1)
+                    segment = []
+                else:
+                    x, y = point
+                    px = WIDTH//2 + int(x)
+                    py = HEIGHT//2 + int(y)
+                    segment.append((px, py))
+            if len(segment) > 1:
+                pygame.draw.lines(screen, (120,120,160), False, segment, 1)
+
+        # =====================
+        # DRAW BODIES
+        # =====================
+        for b in bodies:
+            draw_body_wrapped(screen, b)
+
+        # =====================
+        # VELOCITY PREVIEW
+        # =====================
+        if dragging:
+            mx, my = pygame.mouse.get_pos()
+            pygame.draw.line(screen, (255,100,100), start_pos, (mx,my), 2)
+
+        # =====================
+        # ENERGY DISPLAY
+        # =====================
+        if frame % ENERGY_EVERY == 0:
+            KE, PE, TE = total_energy(bodies, WIDTH, HEIGHT)
+            info = font.render(f"KE: {KE:.2f} | PE: {PE:.2f} | TE: {TE:.2f} | Mass: {BASE_MASS}", True, (255,255,255))
+        frame += 1
+        screen.blit(info, (10,10))
+        if spray_full:
+            notice = font.render(f"Body limit reached ({MAX_BODIES}): remove or merge some to spray more", True, (255,120,120))
+            screen.blit(notice, (10, HEIGHT - 30))
+        profiler.draw(screen, (10, 35))
+        profiler.mark("draw")
+
+        pygame.display.flip()
+        profiler.mark("flip")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""Run any pygame demo in src/ headless, as fast as possible.
+
+    python headlessRunner.py pong.py --frames 3600
+    python headlessRunner.py balls.py --frames 600 --script spawn.json --png out/balls_%05d.png
+    python headlessRunner.py 3dRenderer/3dRenderer.py --frames 300 \\
+        --pipe "ffmpeg -y -f rawvideo -pix_fmt rgb24 -s {width}x{height} -r {fps} -i - out.mp4"
+
+The demo runs unmodified: SDL uses the dummy video driver, ``pygame.time.Clock``
+is swapped for a fixed-step clock that never sleeps, keyboard/mouse state comes
+from a JSON input script and ``pygame.display.flip`` is hooked to count, time
+and optionally export frames. After ``--frames`` frames a QUIT event is posted.
+
+Input script: a list of events, each with the frame it is delivered on:
+
+    [{"frame": 10, "type": "keydown", "key": "w"},
+     {"frame": 40, "type": "keyup", "key": "w"},
+     {"frame": 50, "type": "mousebuttondown", "button": 3, "pos": [300, 200]},
+     {"frame": 51, "type": "mousebuttonup", "button": 3, "pos": [300, 200]},
+     {"frame": 60, "type": "mousemotion", "pos": [320, 210]}]
+"""
+import json
+import os
+import queue
+import random
+import runpy
+import shlex
+import subprocess
+import sys
+import threading
+import time
+
+import pygame
+
+from frameProfiler import percentile
+
+EVENT_TYPES = {
+    "keydown": pygame.KEYDOWN,
+    "keyup": pygame.KEYUP,
+    "mousebuttondown": pygame.MOUSEBUTTONDOWN,
+    "mousebuttonup": pygame.MOUSEBUTTONUP,
+    "mousemotion": pygame.MOUSEMOTION,
+}
+
+
+# =====================
+# FIXED-STEP CLOCK
+# =====================
+class FixedStepClock:
+    """Drop-in for pygame.time.Clock: every tick reports exactly one frame and never waits.
+
+    Times are float milliseconds (pygame returns ints) so that 60 ticks add
+    up to exactly one second instead of 60 * 17 ms.
+    """
+
+    fps = 60
+
+    def __init__(self):
+        self.step_ms = 1000 / FixedStepClock.fps
+
+    def tick(self, framerate=0):
+        return self.step_ms
+
+    tick_busy_loop = tick
+
+    def get_time(self):
+        return self.step_ms
+
+    def get_rawtime(self):
+        return self.step_ms
+
+    def get_fps(self):
+        return float(FixedStepClock.fps)
+
+
+# =====================
+# SCRIPTED INPUT
+# =====================
+class HeldKeys:
+    """Stands in for the ScancodeWrapper returned by pygame.key.get_pressed()."""
+
+    def __init__(self, held):
+        self.held = held
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class ScriptedInput:
+    def __init__(self, script):
+        self.by_frame = {}
+        for entry in script:
+            self.by_frame.setdefault(entry["frame"], []).append(entry)
+        self.held = set()
+        self.mouse_pos = (0, 0)
+        self.mouse_buttons = [False, False, False]
+
+    def post(self, frame):
+        """Post this frame's events and update the polled key/mouse state."""
+        for entry in self.by_frame.get(frame, ()):
+            kind = EVENT_TYPES[entry["type"]]
+            attrs = {}
+            if "key" in entry:
+                key = pygame.key.key_code(entry["key"])
+                attrs.update(key=key, mod=0, unicode="", scancode=0)
+                if kind == pygame.KEYDOWN:
+                    self.held.add(key)
+                else:
+                    self.held.discard(key)
+            if "pos" in entry:
+                rel = (entry["pos"][0] - self.mouse_pos[0], entry["pos"][1] - self.mouse_pos[1])
+                self.mouse_pos = tuple(entry["pos"])
+                attrs["pos"] = self.mouse_pos
+                if kind == pygame.MOUSEMOTION:
+                    attrs.update(rel=rel, buttons=tuple(self.mouse_buttons))
+            if "button" in entry:
+                attrs["button"] = entry["button"]
+                if entry["button"] <= 3:
+                    self.mouse_buttons[entry["button"] - 1] = kind == pygame.MOUSEBUTTONDOWN
+            attrs.setdefault("pos", self.mouse_pos)
+            pygame.event.post(pygame.event.Event(kind, **attrs))
+
+    def get_pressed(self):
+        return HeldKeys(self.held)
+
+    def get_pos(self):
+        return self.mouse_pos
+
+    def get_mouse_pressed(self, num_buttons=3):
+        return tuple(self.mouse_buttons[:num_buttons])
+
+
+# =====================
+# FRAME WRITER
+# =====================
+class FrameWriterError(RuntimeError):
+    pass
+
+
+class FrameWriter(threading.Thread):
+    """Background thread that encodes captured frames so the demo never waits on disk.
+
+    ``png`` is a %-format pattern (``out/frame_%05d.png``), ``raw`` a file path
+    (``-`` for stdout) and ``pipe`` a shell command receiving rgb24 on stdin;
+    ``{width}``, ``{height}`` and ``{fps}`` are substituted in the command.
+    If writing fails (e.g. the pipe consumer exits) the thread stops and the
+    next ``put`` or ``close`` raises FrameWriterError instead of blocking.
+    """
+
+    def __init__(self, size, fps, png=None, raw=None, pipe=None, max_queue=64):
+        super().__init__(daemon=True)
+        self.size = size
+        self.png = png
+        self.queue = queue.Queue(max_queue)
+        self.raw_file = None
+        self.proc = None
+        self.written = 0
+        self.error = None
+        self._reported = False
+        if png:
+            os.makedirs(os.path.dirname(png) or ".", exist_ok=True)
+        if raw:
+            self.raw_file = sys.stdout.buffer if raw == "-" else open(raw, "wb")
+        if pipe:
+            cmd = pipe.format(width=size[0], height=size[1], fps=fps)
+            self.proc = subprocess.Popen(shlex.split(cmd), stdin=subprocess.PIPE)
+
+    def _raise_error(self):
+        if self.error is not None and not self._reported:
+            self._reported = True
+            raise FrameWriterError(f"frame writer failed: {self.error!r}") from self.error
+
+    def _put(self, item):
+        # blocks when the writer falls behind, which bounds memory use, but never on a dead thread
+        while True:
+            if not self.is_alive():
+                self._raise_error()
+                return
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def put(self, index, data):
+        self._put((index, data))
+
+    def run(self):
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                index, data = item
+                if self.png:
+                    pygame.image.save(pygame.image.frombytes(data, self.size, "RGB"), self.png % index)
+                if self.raw_file:
+                    self.raw_file.write(data)
+                if self.proc:
+                    self.proc.stdin.write(data)
+                self.written += 1
+        except Exception as e:
+            self.error = e
+
+    def close(self):
+        self._put(None)
+        self.join()
+        if self.raw_file and self.raw_file is not sys.stdout.buffer:
+            self.raw_file.close()
+        if self.proc:
+            try:
+                self.proc.stdin.close()
+            except OSError as e:  # the consumer already went away
+                self.error = self.error or e
+            self.proc.wait()
+        self._raise_error()
+
+
+# =====================
+# RUNNER
+# =====================
+def run_demo(path, frames, fps=60, script=(), seed=0, png=None, raw=None, pipe=None, argv=()):
+    """Run the demo at ``path`` for ``frames`` frames and return throughput stats."""
+    # no window or sound device: SDL reads these when the demo calls pygame.init()
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    path = os.path.abspath(path)
+    # the demo runs from its own directory, so resolve output paths first
+    png = png and os.path.abspath(png)
+    raw = raw if raw in (None, "-") else os.path.abspath(raw)
+    inputs = ScriptedInput(script)
+    FixedStepClock.fps = fps
+    random.seed(seed)
+    try:
+        import numpy
+        numpy.random.seed(seed)
+    except ImportError:
+        pass
+
+    real_flip = pygame.display.flip
+    real_update = pygame.display.update
+    real_quit = pygame.quit
+    real_clock = pygame.time.Clock
+    real_get_pressed = pygame.key.get_pressed
+    real_get_pos = pygame.mouse.get_pos
+    real_mouse_pressed = pygame.mouse.get_pressed
+
+    state = {"frame": 0, "writer": None, "last": 0}
+    frame_ns = []
+
+    def on_frame(*args):
+        real_flip()
+        frame = state["frame"]
+        if frame >= frames:
+            return
+        now = time.perf_counter_ns()
+        frame_ns.append(now - state["last"])
+        state["last"] = now
+
+        if png or raw or pipe:
+            screen = pygame.display.get_surface()
+            if state["writer"] is None:
+                state["writer"] = FrameWriter(screen.get_size(), fps, png, raw, pipe)
+                state["writer"].start()
+            state["writer"].put(frame, pygame.image.tobytes(screen, "RGB"))
+
+        state["frame"] = frame + 1
+        if state["frame"] >= frames:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        else:
+            inputs.post(state["frame"])
+
+    pygame.display.flip = on_frame
+    pygame.display.update = on_frame
+    pygame.quit = lambda: None
+    pygame.time.Clock = FixedStepClock
+    pygame.key.get_pressed = inputs.get_pressed
+    pygame.mouse.get_pos = inputs.get_pos
+    pygame.mouse.get_pressed = inputs.get_mouse_pressed
+
+    old_cwd, old_argv, old_path = os.getcwd(), sys.argv, list(sys.path)
+    os.chdir(os.path.dirname(path))
+    sys.argv = [path, *argv]
+    sys.path.insert(0, os.path.dirname(path))
+    try:
+        pygame.init()
+        inputs.post(0)
+        start = state["last"] = time.perf_counter_ns()
+        runpy.run_path(path, run_name="__main__")
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        os.chdir(old_cwd)
+        sys.argv, sys.path[:] = old_argv, old_path
+        pygame.display.flip = real_flip
+        pygame.display.update = real_update
+        pygame.time.Clock = real_clock
+        pygame.key.get_pressed = real_get_pressed
+        pygame.mouse.get_pos = real_get_pos
+        pygame.mouse.get_pressed = real_mouse_pressed
+        pygame.quit = real_quit
+        if state["writer"] is not None:
+            state["writer"].close()
+        real_quit()
+
+    frame_ns.sort()
+    return {
+        "demo": os.path.basename(path),
+        "frames": state["frame"],
+        "seconds": elapsed / 1e9,
+        "fps": state["frame"] / (elapsed / 1e9) if elapsed else 0.0,
+        "frame_ms_p50": percentile(frame_ns, 50) / 1e6,
+        "frame_ms_p95": percentile(frame_ns, 95) / 1e6,
+        "frame_ms_p99": percentile(frame_ns, 99) / 1e6,
+        "frames_written": state["writer"].written if state["writer"] else 0,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Headless fixed-step runner for the pygame demos")
+    parser.add_argument("demo", help="path to the demo script, or its launcher name")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--fps", type=int, default=60, help="simulated frame rate reported by the clock")
+    parser.add_argument("--script", help="JSON input script")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--png", help="PNG sequence pattern, e.g. out/frame_%%05d.png")
+    parser.add_argument("--raw", help="write raw rgb24 frames to this file ('-' for stdout)")
+    parser.add_argument("--pipe", help="shell command that receives raw rgb24 frames on stdin")
+    # anything not understood here is passed on to the demo
+    args, demo_args = parser.parse_known_args()
+
+    script = []
+    if args.script:
+        with open(args.script) as f:
+            script = json.load(f)
+
+    # launcher names (see python -m demos list) work as well as paths
+    from demos import DEMOS
+    if args.demo in DEMOS and not DEMOS[args.demo].module:
+        args.demo = DEMOS[args.demo].file
+
+    try:
+        stats = run_demo(args.demo, args.frames, args.fps, script, args.seed,
+                         args.png, args.raw, args.pipe, demo_args)
+    except FrameWriterError as e:
+        sys.exit(f"headlessRunner: {e}")
+    print(json.dumps(stats), file=sys.stderr if args.raw == "-" else sys.stdout)
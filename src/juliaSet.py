@@ -15,21 +15,26 @@ MAX_ITER = 80
 # your requested character set
 CHARS = " .:-=+*#%@"
 
-for y in range(HEIGHT):
-    for x in range(WIDTH):
-        zr = XMIN + (x / WIDTH) * (XMAX - XMIN)
-        zi = YMIN + (y / HEIGHT) * (YMAX - YMIN)
-
-        i = 0
-        while zr*zr + zi*zi <= 4 and i < MAX_ITER:
-            zr, zi = (
-                zr*zr - zi*zi + C_REAL,
-                2*zr*zi + C_IMAG
-            )
-            i += 1
-
-        # map iterations → ASCII
-        index = i * (len(CHARS) - 1) // MAX_ITER
-        print(CHARS[index], end="")
-
-    print()
+def main():
+    for y in range(HEIGHT):
+        for x in range(WIDTH):
+            zr = XMIN + (x / WIDTH) * (XMAX - XMIN)
+            zi = YMIN + (y / HEIGHT) * (YMAX - YMIN)
+
+            i = 0
+            while zr*zr + zi*zi <= 4 and i < MAX_ITER:
+                zr, zi = (
+                    zr*zr - zi*zi + C_REAL,
+                    2*zr*zi + C_IMAG
+                )
+                i += 1
+
+            # map iterations → ASCII
+            index = i * (len(CHARS) - 1) // MAX_ITER
+            print(CHARS[index], end="")
+
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,9 @@
-import pygame
-pygame.init()
+from frameProfiler import FrameProfiler
 
 # -----------------------------
 # Screen / timing
 # -----------------------------
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Smooth Pong")
-clock = pygame.time.Clock()
 FPS = 60
 
 # -----------------------------
@@ -33,26 +29,31 @@ MAX_Y_SPEED = 7
 AI_SPEED = 4       # max pixels per frame the AI paddle can move
 AI_MARGIN = 10     # dead zone in pixels around paddle center where AI doesn't react
 
-# Player paddle (left)
-left_paddle = pygame.Rect(50, HEIGHT // 2 - PADDLE_HEIGHT // 2, PADDLE_WIDTH, PADDLE_HEIGHT)
-# AI paddle (right)
-right_paddle = pygame.Rect(WIDTH - 60, HEIGHT // 2 - PADDLE_HEIGHT // 2, PADDLE_WIDTH, PADDLE_HEIGHT)
-# Ball
-ball = pygame.Rect(WIDTH // 2 - BALL_SIZE // 2, HEIGHT // 2 - BALL_SIZE // 2, BALL_SIZE, BALL_SIZE)
-
-# Scores and font
+# Paddles, ball and scores; created by reset_game() so importing needs no pygame
+left_paddle = right_paddle = ball = None
 left_score = 0
 right_score = 0
-font = pygame.font.Font(None, 50)
+
+def reset_game():
+    """Put paddles, ball and scores back to the start of a match."""
+    global left_paddle, right_paddle, ball, ball_speed_x, ball_speed_y, left_score, right_score
+    import pygame
+
+    # Player paddle (left)
+    left_paddle = pygame.Rect(50, HEIGHT // 2 - PADDLE_HEIGHT // 2, PADDLE_WIDTH, PADDLE_HEIGHT)
+    # AI paddle (right)
+    right_paddle = pygame.Rect(WIDTH - 60, HEIGHT // 2 - PADDLE_HEIGHT // 2, PADDLE_WIDTH, PADDLE_HEIGHT)
+    # Ball
+    ball = pygame.Rect(WIDTH // 2 - BALL_SIZE // 2, HEIGHT // 2 - BALL_SIZE // 2, BALL_SIZE, BALL_SIZE)
+    ball_speed_x, ball_speed_y = 4, 0
+    left_score = right_score = 0
 
 # Cache score surfaces and update only when score changes
-def make_score_surfaces():
+def make_score_surfaces(font):
     left_surf = font.render(str(left_score), True, WHITE)
     right_surf = font.render(str(right_score), True, WHITE)
     return left_surf, right_surf
 
-left_score_surf, right_score_surf = make_score_surfaces()
-
 # -----------------------------
 # Paddle bounce (8-section) with clipping fix
 # -----------------------------
@@ -80,20 +81,16 @@ def paddle_bounce(paddle):
         ball_speed_y = max(-MAX_Y_SPEED, min(MAX_Y_SPEED, ball_speed_y))
 
 # -----------------------------
-# Main loop
+# One simulation frame (input -> AI -> ball -> collisions -> scoring)
 # -----------------------------
-running = True
-while running:
-    # ---- events ----
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+def step_game(up, down):
+    """Advance the game by one frame (after reset_game()). Returns True when the score changed."""
+    global ball_speed_x, ball_speed_y, left_score, right_score
 
     # ---- input (player) ----
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_w]:
+    if up:
         left_paddle.y -= paddle_speed
-    if keys[pygame.K_s]:
+    if down:
         left_paddle.y += paddle_speed
 
     # clamp player paddle inside screen
@@ -145,24 +142,100 @@ while running:
         ball.center = (WIDTH // 2, HEIGHT // 2)
         ball_speed_x = -4
         ball_speed_y = 0
+    return score_changed
 
-    # update score surfaces only when score changed
-    if score_changed:
-        left_score_surf, right_score_surf = make_score_surfaces()
-
-    # ---- drawing ----
-    screen.fill(BLACK)
-    pygame.draw.rect(screen, WHITE, left_paddle)
-    pygame.draw.rect(screen, WHITE, right_paddle)
-    pygame.draw.ellipse(screen, WHITE, ball)
-    pygame.draw.aaline(screen, WHITE, (WIDTH // 2, 0), (WIDTH // 2, HEIGHT))
-
-    # draw scores (using cached surfaces)
-    screen.blit(left_score_surf, (WIDTH // 4 - left_score_surf.get_width() // 2, 20))
-    screen.blit(right_score_surf, (3 * WIDTH // 4 - right_score_surf.get_width() // 2, 20))
-
-    # ---- update ----
-    pygame.display.flip()
-    clock.tick(FPS)
+# -----------------------------
+# Network play: copy the rollback session's state onto the drawn objects
+# -----------------------------
+def sync_from_session(session):
+    global left_score, right_score
+    left_y, right_y, bx, by, _, _, ls, rs = (int(v) for v in session.state())
+    left_paddle.y = left_y
+    right_paddle.y = right_y
+    ball.topleft = (bx, by)
+    score_changed = (ls, rs) != (left_score, right_score)
+    left_score, right_score = ls, rs
+    return score_changed
 
-pygame.quit()
+# -----------------------------
+# Main loop
+# -----------------------------
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Smooth Pong")
+    parser.add_argument("--net", choices=("left", "right"),
+                        help="two-player network game, playing this side")
+    parser.add_argument("--port", type=int, default=47700, help="local UDP port")
+    parser.add_argument("--peer", default="127.0.0.1:47701", help="remote HOST:PORT")
+    args = parser.parse_args(argv)
+
+    import pygame
+
+    reset_game()
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Smooth Pong")
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 50)
+    left_score_surf, right_score_surf = make_score_surfaces(font)
+
+    session = None
+    if args.net:
+        from pongNetplay import RollbackSession, UdpTransport
+
+        host, port = args.peer.rsplit(":", 1)
+        session = RollbackSession(args.net, UdpTransport(("0.0.0.0", args.port), (host, int(port))))
+        pygame.display.set_caption(f"Smooth Pong (net, {args.net})")
+
+    profiler = FrameProfiler("pong")
+    running = True
+    while running:
+        # ---- events ----
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            profiler.handle_event(event)
+        profiler.mark("events")
+
+        keys = pygame.key.get_pressed()
+
+        if session is None:
+            score_changed = step_game(keys[pygame.K_w], keys[pygame.K_s])
+        else:
+            # both peers steer their own paddle with W/S
+            session.advance(keys[pygame.K_s] - keys[pygame.K_w])
+            score_changed = sync_from_session(session)
+
+        # update score surfaces only when score changed
+        if score_changed:
+            left_score_surf, right_score_surf = make_score_surfaces(font)
+        profiler.mark("update")
+
+        # ---- drawing ----
+        screen.fill(BLACK)
+        pygame.draw.rect(screen, WHITE, left_paddle)
+        pygame.draw.rect(screen, WHITE, right_paddle)
+        pygame.draw.ellipse(screen, WHITE, ball)
+        pygame.draw.aaline(screen, WHITE, (WIDTH // 2, 0), (WIDTH // 2, HEIGHT))
+
+        # draw scores (using cached surfaces)
+        screen.blit(left_score_surf, (WIDTH // 4 - left_score_surf.get_width() // 2, 20))
+        screen.blit(right_score_surf, (3 * WIDTH // 4 - right_score_surf.get_width() // 2, 20))
+        profiler.draw(screen)
+        profiler.mark("draw")
+
+        # ---- update ----
+        pygame.display.flip()
+        profiler.mark("flip")
+        clock.tick(FPS)
+        profiler.mark("tick")
+        profiler.end_frame()
+
+    if session is not None:
+        session.transport.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
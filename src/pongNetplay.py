@@ -0,0 +1,300 @@
+import random
+import socket
+import struct
+import time
+
+import numpy as np
+
+from pongVecEnv import PongVecEnv
+
+# -----------------------------
+# Wire format
+# -----------------------------
+# ack (last contiguous frame received from the peer), first frame, count,
+# followed by `count` signed input bytes (-1 up, 0 stay, 1 down)
+HEADER = struct.Struct("!iiB")
+MAX_INPUTS_PER_PACKET = 255
+
+
+def encode_inputs(ack, first_frame, inputs):
+    return HEADER.pack(ack, first_frame, len(inputs)) + struct.pack(f"{len(inputs)}b", *inputs)
+
+
+def decode_inputs(data):
+    ack, first_frame, count = HEADER.unpack_from(data)
+    inputs = struct.unpack_from(f"{count}b", data, HEADER.size)
+    return ack, first_frame, inputs
+
+
+# -----------------------------
+# Transports
+# -----------------------------
+class UdpTransport:
+    """Non-blocking UDP socket talking to a single peer."""
+
+    def __init__(self, local_addr, remote_addr):
+        self.remote_addr = remote_addr
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(local_addr)
+        self.sock.setblocking(False)
+
+    def send(self, data):
+        try:
+            self.sock.sendto(data, self.remote_addr)
+        except OSError:
+            # peer not up yet (ICMP port unreachable) -- inputs are resent anyway
+            pass
+
+    def receive(self):
+        packets = []
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(2048)
+            except (BlockingIOError, ConnectionError):
+                return packets
+            packets.append(data)
+
+    def close(self):
+        self.sock.close()
+
+
+class LaggyTransport:
+    """Wraps a transport and injects a fixed delay (in frames) and packet loss.
+
+    ``receive`` is called once per frame by the session and doubles as the
+    clock that releases delayed packets.
+    """
+
+    def __init__(self, inner, delay_frames=0, loss=0.0, seed=None):
+        self.inner = inner
+        self.delay_frames = delay_frames
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.queue = []
+
+    def send(self, data):
+        if self.rng.random() < self.loss:
+            return
+        self.queue.append((self.tick + self.delay_frames, data))
+
+    def receive(self):
+        self.tick += 1
+        while self.queue and self.queue[0][0] <= self.tick:
+            self.inner.send(self.queue.pop(0)[1])
+        return self.inner.receive()
+
+    def close(self):
+        self.inner.close()
+
+
+# -----------------------------
+# Rollback session
+# -----------------------------
+class RollbackSession:
+    """Runs one Pong game in lockstep with a remote peer, GGPO style.
+
+    Only inputs travel over the network. The remote paddle is predicted to
+    keep doing whatever it did last; when the real input for an already
+    simulated frame arrives and differs, the game is rolled back to the
+    snapshot taken before that frame and resimulated up to the present.
+    If the peer falls more than ``max_rollback`` frames behind, ``advance``
+    stalls instead of predicting further.
+    """
+
+    def __init__(self, side, transport, max_rollback=8, input_delay=0):
+        assert side in ("left", "right")
+        self.side = side
+        self.transport = transport
+        self.max_rollback = max_rollback
+        self.input_delay = input_delay
+
+        self.env = PongVecEnv(1)
+        self.frame = 0  # next frame to simulate
+        self.snapshots = [None] * (max_rollback + 1)
+
+        self.local_inputs = [0] * input_delay
+        self.remote_inputs = []  # confirmed remote inputs, contiguous from frame 0
+        self.remote_early = {}  # confirmed but arrived out of order
+        self.remote_used = []  # remote input each simulated frame was run with
+        self.peer_ack = -1  # last of our frames the peer has confirmed
+
+        # stats
+        self.rollbacks = 0
+        self.resimulated_frames = 0
+        self.max_resimulated = 0
+        self.stalls = 0
+
+    # ---- helpers ----
+    @property
+    def confirmed_frame(self):
+        """Last frame for which the remote input is known."""
+        return len(self.remote_inputs) - 1
+
+    def _predict(self, frame):
+        if frame < len(self.remote_inputs):
+            return self.remote_inputs[frame]
+        return self.remote_inputs[-1] if self.remote_inputs else 0
+
+    def _simulate(self, frame):
+        self.snapshots[frame % len(self.snapshots)] = self.env.snapshot()
+        local = self.local_inputs[frame]
+        remote = self._predict(frame)
+        if frame < len(self.remote_used):
+            self.remote_used[frame] = remote
+        else:
+            self.remote_used.append(remote)
+        actions = (local, remote) if self.side == "left" else (remote, local)
+        self.env.step(np.array([actions]))
+
+    # ---- networking ----
+    def _send(self):
+        first = self.peer_ack + 1
+        last = min(len(self.local_inputs), first + MAX_INPUTS_PER_PACKET)
+        self.transport.send(encode_inputs(self.confirmed_frame, first, self.local_inputs[first:last]))
+
+    def _receive(self):
+        """Store newly arrived remote inputs; return the earliest mispredicted frame."""
+        rollback_from = None
+        for data in self.transport.receive():
+            ack, first_frame, inputs = decode_inputs(data)
+            self.peer_ack = max(self.peer_ack, ack)
+            for offset, value in enumerate(inputs):
+                frame = first_frame + offset
+                if frame >= len(self.remote_inputs):
+                    self.remote_early[frame] = value
+
+            while len(self.remote_inputs) in self.remote_early:
+                frame = len(self.remote_inputs)
+                value = self.remote_early.pop(frame)
+                self.remote_inputs.append(value)
+                if frame < self.frame and self.remote_used[frame] != value:
+                    if rollback_from is None or frame < rollback_from:
+                        rollback_from = frame
+        return rollback_from
+
+    def _rollback(self, frame):
+        self.env.restore(self.snapshots[frame % len(self.snapshots)])
+        count = self.frame - frame
+        for f in range(frame, self.frame):
+            self._simulate(f)
+        self.rollbacks += 1
+        self.resimulated_frames += count
+        self.max_resimulated = max(self.max_resimulated, count)
+
+    # ---- one frame ----
+    def advance(self, local_input):
+        """Feed this frame's local input and step the game.
+
+        Returns False (and leaves the game where it is) while waiting for
+        the peer to catch up.
+        """
+        rollback_from = self._receive()
+        if rollback_from is not None:
+            self._rollback(rollback_from)
+
+        if self.frame - self.confirmed_frame > self.max_rollback:
+            self.stalls += 1
+            self._send()
+            return False
+
+        self.local_inputs.append(int(local_input))
+        self._send()
+        self._simulate(self.frame)
+        self.frame += 1
+        return True
+
+    def state(self):
+        return self.env.snapshot()[:, 0]
+
+
+# -----------------------------
+# Local loopback test
+# -----------------------------
+def scripted_input(seed):
+    """Deterministic 'player' that holds a direction for a random number of frames."""
+    rng = random.Random(seed)
+    value, left = 0, 0
+    while True:
+        if left == 0:
+            value, left = rng.choice((-1, 0, 1)), rng.randint(1, 40)
+        left -= 1
+        yield value
+
+
+def run_loopback_test(frames=3600, delay_frames=6, loss=0.1, max_rollback=8,
+                      base_port=47800, seed=0):
+    """Play two sessions against each other over 127.0.0.1 and check they agree.
+
+    Both peers are driven by scripted inputs; afterwards the game is replayed
+    offline with the true inputs and all three final states must match.
+    """
+    addr_a = ("127.0.0.1", base_port)
+    addr_b = ("127.0.0.1", base_port + 1)
+    peer_a = RollbackSession("left", LaggyTransport(UdpTransport(addr_a, addr_b), delay_frames, loss, seed),
+                             max_rollback)
+    peer_b = RollbackSession("right", LaggyTransport(UdpTransport(addr_b, addr_a), delay_frames, loss, seed + 1),
+                             max_rollback)
+    inputs_a, inputs_b = scripted_input(seed), scripted_input(seed + 1)
+    pending_a, pending_b = next(inputs_a), next(inputs_b)
+
+    advance_ns = []
+    ticks = 0
+    try:
+        while peer_a.frame < frames or peer_b.frame < frames \
+                or peer_a.confirmed_frame < frames - 1 or peer_b.confirmed_frame < frames - 1:
+            for peer, name in ((peer_a, "a"), (peer_b, "b")):
+                start = time.perf_counter_ns()
+                if peer.frame < frames:
+                    if peer.advance(pending_a if name == "a" else pending_b):
+                        if name == "a":
+                            pending_a = next(inputs_a)
+                        else:
+                            pending_b = next(inputs_b)
+                else:
+                    # finished: keep exchanging inputs until everything is confirmed
+                    rollback_from = peer._receive()
+                    if rollback_from is not None:
+                        peer._rollback(rollback_from)
+                    peer._send()
+                advance_ns.append(time.perf_counter_ns() - start)
+            ticks += 1
+            # loopback delivery is near-instant but not synchronous
+            time.sleep(0.0002)
+            if ticks > frames * 20:
+                raise RuntimeError("loopback test did not converge")
+    finally:
+        peer_a.transport.close()
+        peer_b.transport.close()
+
+    reference = PongVecEnv(1)
+    for f in range(frames):
+        reference.step(np.array([[peer_a.local_inputs[f], peer_b.local_inputs[f]]]))
+
+    ok = (np.array_equal(peer_a.state(), peer_b.state())
+          and np.array_equal(peer_a.state(), reference.snapshot()[:, 0]))
+
+    advance_ns = np.array(advance_ns)
+    print(f"frames={frames} delay={delay_frames}f loss={loss:.0%} max_rollback={max_rollback}")
+    for peer, name in ((peer_a, "left"), (peer_b, "right")):
+        print(f"  {name:5s}: rollbacks={peer.rollbacks} resimulated={peer.resimulated_frames} "
+              f"max_resim={peer.max_resimulated} stalls={peer.stalls}")
+    print(f"  advance: p50={np.percentile(advance_ns, 50) / 1e3:.0f}us "
+          f"p99={np.percentile(advance_ns, 99) / 1e3:.0f}us max={advance_ns.max() / 1e3:.0f}us")
+    print(f"  final score {peer_a.state()[6]}:{peer_a.state()[7]} -> {'IN SYNC' if ok else 'DESYNC'}")
+    return ok
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rollback netplay loopback test for Pong")
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument("--delay", type=int, default=6, help="injected one-way delay in frames")
+    parser.add_argument("--loss", type=float, default=0.1, help="packet loss probability")
+    parser.add_argument("--max-rollback", type=int, default=8)
+    parser.add_argument("--port", type=int, default=47800)
+    args = parser.parse_args()
+
+    ok = run_loopback_test(args.frames, args.delay, args.loss, args.max_rollback, args.port)
+    raise SystemExit(0 if ok else 1)
@@ -0,0 +1,254 @@
+import numpy as np
+
+# -----------------------------
+# Rules (kept identical to pong.py)
+# -----------------------------
+WIDTH, HEIGHT = 800, 600
+
+PADDLE_WIDTH, PADDLE_HEIGHT = 10, 100
+BALL_SIZE = 20
+
+PADDLE_SPEED = 5
+SERVE_SPEED_X = 4
+MAX_Y_SPEED = 7
+
+AI_SPEED = 4
+AI_MARGIN = 10
+
+LEFT_X = 50
+RIGHT_X = WIDTH - 60
+PADDLE_START_Y = HEIGHT // 2 - PADDLE_HEIGHT // 2
+BALL_START_X = WIDTH // 2 - BALL_SIZE // 2
+BALL_START_Y = HEIGHT // 2 - BALL_SIZE // 2
+
+# vertical speeds mapped to 8 paddle sections (top -> bottom)
+BOUNCE_SPEEDS = np.array([-6, -4, -2, -1, 1, 2, 4, 6], dtype=np.int32)
+
+
+# -----------------------------
+# Batched environment
+# -----------------------------
+class PongVecEnv:
+    """N headless Pong games stepped together with NumPy.
+
+    State lives in flat int32 arrays (one entry per game) and every frame runs
+    the same integer rules as the pygame loop in pong.py, so a game driven by
+    the same inputs ends up in exactly the same place.
+
+    Actions are ``-1`` (up), ``0`` (stay) or ``1`` (down). ``step`` takes
+    either an ``(N,)`` array for the left paddle, in which case the right
+    paddle is played by the built-in AI, or an ``(N, 2)`` array for both.
+    """
+
+    def __init__(self, num_games):
+        self.num_games = num_games
+        n = num_games
+        self.left_y = np.empty(n, dtype=np.int32)
+        self.right_y = np.empty(n, dtype=np.int32)
+        self.ball_x = np.empty(n, dtype=np.int32)
+        self.ball_y = np.empty(n, dtype=np.int32)
+        self.ball_vx = np.empty(n, dtype=np.int32)
+        self.ball_vy = np.empty(n, dtype=np.int32)
+        self.left_score = np.empty(n, dtype=np.int32)
+        self.right_score = np.empty(n, dtype=np.int32)
+        self.reset()
+
+    def reset(self):
+        self.left_y[:] = PADDLE_START_Y
+        self.right_y[:] = PADDLE_START_Y
+        self.ball_x[:] = BALL_START_X
+        self.ball_y[:] = BALL_START_Y
+        self.ball_vx[:] = SERVE_SPEED_X
+        self.ball_vy[:] = 0
+        self.left_score[:] = 0
+        self.right_score[:] = 0
+        return self.observe()
+
+    def _fields(self):
+        return (self.left_y, self.right_y, self.ball_x, self.ball_y,
+                self.ball_vx, self.ball_vy, self.left_score, self.right_score)
+
+    def snapshot(self):
+        """Copy of the full game state as an (8, N) int32 array."""
+        return np.stack(self._fields())
+
+    def restore(self, snap):
+        for field, row in zip(self._fields(), snap):
+            field[:] = row
+
+    def observe(self):
+        """(N, 6) int32 array: left_y, right_y, ball_x, ball_y, ball_vx, ball_vy."""
+        return np.stack(
+            (self.left_y, self.right_y, self.ball_x, self.ball_y, self.ball_vx, self.ball_vy),
+            axis=1,
+        )
+
+    # ---- paddles ----
+    @staticmethod
+    def _clamp_paddle(y):
+        # same order as pong.py: clamp top, then bottom
+        np.maximum(y, 0, out=y)
+        np.minimum(y, HEIGHT - PADDLE_HEIGHT, out=y)
+
+    def _ai_move(self):
+        diff = (self.ball_y + BALL_SIZE // 2) - (self.right_y + PADDLE_HEIGHT // 2)
+        active = np.abs(diff) > AI_MARGIN
+        move = np.where(diff > 0, AI_SPEED, -AI_SPEED)
+        # snap exactly when closer than AI_SPEED (kept for parity with pong.py)
+        move = np.where(np.abs(diff) < AI_SPEED, diff, move)
+        self.right_y += np.where(active, move, 0).astype(np.int32)
+
+    # ---- ball ----
+    def _paddle_bounce(self, paddle_x, paddle_y):
+        # pygame.Rect.colliderect on two non-empty rects
+        hit = (
+            (self.ball_x < paddle_x + PADDLE_WIDTH)
+            & (paddle_x < self.ball_x + BALL_SIZE)
+            & (self.ball_y < paddle_y + PADDLE_HEIGHT)
+            & (paddle_y < self.ball_y + BALL_SIZE)
+        )
+        if not hit.any():
+            return
+
+        section_height = PADDLE_HEIGHT / 8.0
+        rel = (self.ball_y + BALL_SIZE // 2) - paddle_y
+        hit_pos = np.floor_divide(rel, section_height).astype(np.int64)
+        np.clip(hit_pos, 0, 7, out=hit_pos)
+
+        vx = np.where(hit, -self.ball_vx, self.ball_vx)
+        # reposition ball to avoid clipping inside paddle
+        new_x = np.where(vx > 0, paddle_x + PADDLE_WIDTH, paddle_x - BALL_SIZE)
+        vy = np.clip(BOUNCE_SPEEDS[hit_pos], -MAX_Y_SPEED, MAX_Y_SPEED)
+
+        self.ball_vx[:] = vx
+        self.ball_x[:] = np.where(hit, new_x, self.ball_x)
+        self.ball_vy[:] = np.where(hit, vy, self.ball_vy)
+
+    def _serve(self, mask, speed_x):
+        self.ball_x[mask] = BALL_START_X
+        self.ball_y[mask] = BALL_START_Y
+        self.ball_vx[mask] = speed_x
+        self.ball_vy[mask] = 0
+
+    # ---- one frame for every game ----
+    def step(self, actions):
+        """Advance all games by one frame.
+
+        Returns ``(obs, rewards)`` where ``rewards`` is +1 for games in which
+        the left player scored this frame, -1 where the right player scored
+        and 0 elsewhere.
+        """
+        actions = np.asarray(actions)
+        if actions.ndim == 1:
+            left_action, right_action = actions, None
+        else:
+            left_action, right_action = actions[:, 0], actions[:, 1]
+
+        self.left_y += (np.sign(left_action) * PADDLE_SPEED).astype(np.int32)
+        self._clamp_paddle(self.left_y)
+
+        if right_action is None:
+            self._ai_move()
+        else:
+            self.right_y += (np.sign(right_action) * PADDLE_SPEED).astype(np.int32)
+        self._clamp_paddle(self.right_y)
+
+        self.ball_x += self.ball_vx
+        self.ball_y += self.ball_vy
+
+        # top/bottom walls
+        wall = (self.ball_y <= 0) | (self.ball_y + BALL_SIZE >= HEIGHT)
+        np.negative(self.ball_vy, out=self.ball_vy, where=wall)
+        np.maximum(self.ball_y, 0, out=self.ball_y)
+        np.minimum(self.ball_y, HEIGHT - BALL_SIZE, out=self.ball_y)
+
+        self._paddle_bounce(LEFT_X, self.left_y)
+        self._paddle_bounce(RIGHT_X, self.right_y)
+
+        rewards = np.zeros(self.num_games, dtype=np.int8)
+
+        right_scored = self.ball_x <= 0
+        self.right_score += right_scored
+        rewards[right_scored] = -1
+        self._serve(right_scored, SERVE_SPEED_X)
+
+        left_scored = self.ball_x + BALL_SIZE >= WIDTH
+        self.left_score += left_scored
+        rewards[left_scored] = 1
+        self._serve(left_scored, -SERVE_SPEED_X)
+
+        return self.observe(), rewards
+
+
+# -----------------------------
+# Parity check against pong.py
+# -----------------------------
+def random_trace(frames, seed=0):
+    """Seeded W/S key trace as (up, down) pairs, each held for a few frames like a player would."""
+    rng = np.random.default_rng(seed)
+    trace = []
+    while len(trace) < frames:
+        keys = (int(rng.integers(2)), int(rng.integers(2)))
+        trace.extend([keys] * int(rng.integers(1, 40)))
+    return trace[:frames]
+
+
+def load_trace(path):
+    """Read a trace file: one frame per line, ``up down`` as 0/1."""
+    with open(path) as f:
+        return [tuple(int(v) for v in line.split()) for line in f if line.strip()]
+
+
+def check_parity(trace):
+    """Play ``trace`` through pong.step_game and a one-game PongVecEnv side by side.
+
+    Raises AssertionError at the first frame where the two states differ.
+    """
+    import pong
+
+    pong.reset_game()
+    env = PongVecEnv(1)
+    for frame, (up, down) in enumerate(trace):
+        pong.step_game(up, down)
+        env.step(np.array([down - up]))
+        expected = (pong.left_paddle.y, pong.right_paddle.y, pong.ball.x, pong.ball.y,
+                    pong.ball_speed_x, pong.ball_speed_y, pong.left_score, pong.right_score)
+        got = tuple(int(v) for v in env.snapshot()[:, 0])
+        if got != expected:
+            raise AssertionError(f"frame {frame}: pong.py {expected} != PongVecEnv {got}")
+    return pong.left_score, pong.right_score
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Benchmark PongVecEnv, or check it against pong.py")
+    parser.add_argument("--check", action="store_true", help="replay a W/S trace through pong.py and PongVecEnv")
+    parser.add_argument("--trace", help="trace file for --check (default: a seeded random trace)")
+    parser.add_argument("--frames", type=int, default=20000, help="frames of random trace for --check")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.check:
+        trace = load_trace(args.trace) if args.trace else random_trace(args.frames, args.seed)
+        try:
+            left, right = check_parity(trace)
+        except AssertionError as e:
+            sys.exit(f"parity check failed at {e}")
+        print(f"parity ok: {len(trace)} frames identical (score {left}-{right})")
+        sys.exit()
+
+    NUM_GAMES = 4096
+    FRAMES = 2000
+
+    env = PongVecEnv(NUM_GAMES)
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        env.step(rng.integers(-1, 2, NUM_GAMES))
+    elapsed = time.perf_counter() - start
+    print(f"{NUM_GAMES * FRAMES / elapsed:,.0f} game-frames/s "
+          f"({NUM_GAMES} games x {FRAMES} frames in {elapsed:.2f}s)")
+    print(f"rallies finished: {int(env.left_score.sum() + env.right_score.sum())}")
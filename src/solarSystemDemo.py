@@ -1,6 +1,7 @@
-import pygame
 import math
 
+from frameProfiler import FrameProfiler
+
 # =====================
 # CONFIGURATION
 # =====================
@@ -79,74 +80,93 @@ def update(bodies, dt):
             b.trail.pop(0)
 
 # =====================
-# MAIN
+# CREATE BODIES
 # =====================
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("2D Planet Simulator (Realistic Gravity)")
-clock = pygame.time.Clock()
+def create_bodies():
+    """Sun, Earth and Mars in SI units."""
+    return [
+        # Sun
+        Body(
+            x=0, y=0,
+            vx=0, vy=0,
+            mass=1.989e30,
+            radius=10,
+            color=(255, 255, 0)
+        ),
+
+        # Earth
+        Body(
+            x=1.496e11, y=0,
+            vx=0, vy=29_780,
+            mass=5.972e24,
+            radius=5,
+            color=(100, 150, 255)
+        ),
+
+        # Mars
+        Body(
+            x=2.279e11, y=0,
+            vx=0, vy=24_070,
+            mass=6.39e23,
+            radius=4,
+            color=(255, 100, 100)
+        )
+    ]
 
 # =====================
-# CREATE BODIES
+# MAIN
 # =====================
-bodies = [
-    # Sun
-    Body(
-        x=0, y=0,
-        vx=0, vy=0,
-        mass=1.989e30,
-        radius=10,
-        color=(255, 255, 0)
-    ),
-
-    # Earth
-    Body(
-        x=1.496e11, y=0,
-        vx=0, vy=29_780,
-        mass=5.972e24,
-        radius=5,
-        color=(100, 150, 255)
-    ),
-
-    # Mars
-    Body(
-        x=2.279e11, y=0,
-        vx=0, vy=24_070,
-        mass=6.39e23,
-        radius=4,
-        color=(255, 100, 100)
-    )
-]
-
-compute_gravity(bodies)
-
-running = True
-while running:
-    clock.tick(FPS)
-    screen.fill((0, 0, 0))
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    update(bodies, DT)
-
-    # Draw trails
-    for b in bodies:
-        if len(b.trail) > 1:
-            points = []
-            for tx, ty in b.trail:
-                px = WIDTH // 2 + int(tx / SCALE)
-                py = HEIGHT // 2 + int(ty / SCALE)
-                points.append((px, py))
-            pygame.draw.lines(screen, b.color, False, points, 1)
-
-    # Draw bodies
-    for b in bodies:
-        px = WIDTH // 2 + int(b.x / SCALE)
-        py = HEIGHT // 2 + int(b.y / SCALE)
-        pygame.draw.circle(screen, b.color, (px, py), b.radius)
+def main():
+    import pygame
 
-    pygame.display.flip()
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("2D Planet Simulator (Realistic Gravity)")
+    clock = pygame.time.Clock()
 
-pygame.quit()
+    bodies = create_bodies()
+    compute_gravity(bodies)
+    profiler = FrameProfiler("solarSystemDemo")
+
+    running = True
+    while running:
+        clock.tick(FPS)
+        profiler.mark("tick")
+        profiler.end_frame()
+        screen.fill((0, 0, 0))
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            profiler.handle_event(event)
+        profiler.mark("events")
+
+        update(bodies, DT)
+        profiler.mark("update")
+
+        # Draw trails
+        for b in bodies:
+            if len(b.trail) > 1:
+                points = []
+                for tx, ty in b.trail:
+                    px = WIDTH // 2 + int(tx / SCALE)
+                    py = HEIGHT // 2 + int(ty / SCALE)
+                    points.append((px, py))
+                pygame.draw.lines(screen, b.color, False, points, 1)
+
+        # Draw bodies
+        for b in bodies:
+            px = WIDTH // 2 + int(b.x / SCALE)
+            py = HEIGHT // 2 + int(b.y / SCALE)
+            pygame.draw.circle(screen, b.color, (px, py), b.radius)
+        profiler.draw(screen)
+        profiler.mark("draw")
+
+        pygame.display.flip()
+        profiler.mark("flip")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
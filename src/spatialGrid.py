@@ -0,0 +1,87 @@
+import math
+
+
+# =====================
+# SPATIAL GRID
+# =====================
+class SpatialGrid:
+    """Uniform grid over anything with ``x``, ``y`` and ``radius``, for point and radius queries.
+
+    Every item is filed in each cell its bounding box touches, so small and
+    large circles can share one grid; a cell size around the diameter of
+    the most common item works best. Call ``rebuild`` once per physics
+    step and query as often as needed. Items keep the order they were given
+    in, so ``pick`` returns the one drawn last (on top).
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.count = 0
+
+    def _span(self, x, y, r):
+        size = self.cell_size
+        return int((x - r) // size), int((y - r) // size), int((x + r) // size), int((y + r) // size)
+
+    def rebuild(self, items):
+        cells = {}
+        size = self.cell_size
+        count = 0
+        for item in items:
+            x, y, r = item.x, item.y, item.radius
+            entry = (count, item)
+            cx0, cx1 = int((x - r) // size), int((x + r) // size)
+            cy0, cy1 = int((y - r) // size), int((y + r) // size)
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [entry]
+                    else:
+                        bucket.append(entry)
+            count += 1
+        self.cells = cells
+        self.count = count
+
+    def query_radius(self, x, y, radius):
+        """Items whose circle overlaps the circle of ``radius`` around (x, y)."""
+        cx0, cy0, cx1, cy1 = self._span(x, y, radius)
+        found = {}
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for order, item in self.cells.get((cx, cy), ()):
+                    if order not in found and math.hypot(item.x - x, item.y - y) < item.radius + radius:
+                        found[order] = item
+        return [found[order] for order in sorted(found)]
+
+    def pick(self, x, y):
+        """Topmost item whose circle contains (x, y), or None."""
+        size = self.cell_size
+        best = None
+        for _, item in self.cells.get((int(x // size), int(y // size)), ()):
+            if math.hypot(item.x - x, item.y - y) < item.radius:
+                best = item  # later entries are drawn on top
+        return best
+
+    def pairs(self):
+        """Pairs of items whose circles overlap, each once, in insertion order."""
+        size = self.cell_size
+        out = []
+        for (cx, cy), bucket in self.cells.items():
+            n = len(bucket)
+            for i in range(n - 1):
+                ia, a = bucket[i]
+                ax, ay, ar = a.x, a.y, a.radius
+                for ib, b in bucket[i + 1:]:
+                    dx = b.x - ax
+                    dy = b.y - ay
+                    reach = ar + b.radius
+                    if dx * dx + dy * dy >= reach * reach:
+                        continue
+                    # report the pair only from the cell holding the corner of the bounding box overlap
+                    if (int(max(ax - ar, b.x - b.radius) // size) != cx
+                            or int(max(ay - ar, b.y - b.radius) // size) != cy):
+                        continue
+                    out.append((ia, ib, a, b))
+        out.sort(key=lambda pair: (pair[0], pair[1]))
+        return [(a, b) for _, _, a, b in out]